@@ -0,0 +1,143 @@
+from dataclasses import dataclass
+import time
+
+from fsm_recognize_words import State, accepted_state, transition_table, fsm_recognize_words
+
+# Compiled form of the lab FSM.
+# Characters are mapped to byte classes (class 0 = "not in the alphabet"),
+# the transitions are stored as a dense class x state table of small ints,
+# and for the hot loop every state gets a 256-entry row indexed by the raw byte.
+
+
+@dataclass(frozen=True)
+class CompiledDFA:
+    byte_class: bytes           # byte -> class id, 256 entries
+    table: bytes                # class-major: table[cls * n_states + state]
+    n_states: int
+    n_classes: int
+    start: int
+    invalid: int
+    accepting: frozenset
+    rows: tuple                 # rows[state][byte] -> next state
+
+
+def compile_dfa(transitions=transition_table, accepted=accepted_state,
+                start=State.STATE_START_IS_A, invalid=State.STATE_INVALID,
+                states=None) -> CompiledDFA:
+    if states is None:
+        states = list(type(start))
+    state_id = {s: i for i, s in enumerate(states)}
+    n_states = len(states)
+    if n_states > 256:
+        raise ValueError("too many states for a byte table")
+
+    alphabet = sorted({ch for row in transitions.values() for ch in row})
+    for ch in alphabet:
+        if len(ch) != 1 or ord(ch) > 127:
+            raise ValueError(f"symbol {ch!r} is not a single ASCII character")
+
+    byte_class = bytearray(256)
+    for cls, ch in enumerate(alphabet, start=1):
+        byte_class[ord(ch)] = cls
+    n_classes = len(alphabet) + 1
+
+    # everything not listed goes to the invalid state, which loops on itself
+    table = bytearray([state_id[invalid]]) * (n_classes * n_states)
+    for src, row in transitions.items():
+        for ch, dst in row.items():
+            table[byte_class[ord(ch)] * n_states + state_id[src]] = state_id[dst]
+
+    rows = tuple(
+        bytes(table[byte_class[b] * n_states + s] for b in range(256))
+        for s in range(n_states)
+    )
+    return CompiledDFA(
+        byte_class=bytes(byte_class),
+        table=bytes(table),
+        n_states=n_states,
+        n_classes=n_classes,
+        start=state_id[start],
+        invalid=state_id[invalid],
+        accepting=frozenset(state_id[s] for s in accepted),
+        rows=rows,
+    )
+
+
+compiled_dfa = compile_dfa()
+
+
+def _as_bytes(word):
+    if isinstance(word, str):
+        return word.encode("utf-8")
+    return word
+
+
+# Recognize one word given as bytes / bytearray / memoryview (str is encoded)
+def recognize_bytes(dfa: CompiledDFA, data) -> bool:
+    rows = dfa.rows
+    invalid = dfa.invalid
+    state = dfa.start
+    for b in _as_bytes(data):
+        state = rows[state][b]
+        if state == invalid:
+            return False
+    return state in dfa.accepting
+
+
+# Classify a whole list of words in one call
+def recognize_many(dfa: CompiledDFA, words) -> list[bool]:
+    rows = dfa.rows
+    invalid = dfa.invalid
+    start = dfa.start
+    accepting = dfa.accepting
+    result = []
+    append = result.append
+    for word in words:
+        state = start
+        for b in _as_bytes(word):
+            state = rows[state][b]
+            if state == invalid:
+                break
+        append(state in accepting)
+    return result
+
+
+# Classify a newline-delimited buffer, one result per line.
+# A trailing newline does not produce an extra empty word.
+def recognize_lines(dfa: CompiledDFA, buffer) -> list[bool]:
+    data = bytes(buffer)
+    lines = data.split(b"\n")
+    if data.endswith(b"\n"):
+        lines.pop()
+    return recognize_many(dfa, lines)
+
+
+def main():
+    print("Compiled FSM: dense byte-class table")
+    words = ["ad", "abcd", "abcbcd", "adde", "addede",
+             "a", "abd", "ade", "abccd", "abcdd", "abcbcded", "", "x", "aé"]
+    expected = [fsm_recognize_words(w) for w in words]
+    assert [recognize_bytes(compiled_dfa, w) for w in words] == expected
+    assert recognize_many(compiled_dfa, words) == expected
+    assert recognize_lines(compiled_dfa, memoryview("\n".join(words).encode())) == expected
+    print("[INFO] compiled recognizer matches fsm_recognize_words")
+
+    tokens = ["a" + "bc" * (i % 7) + "d" + "de" * (i % 5) + ("d" if i % 10 == 0 else "")
+              for i in range(200_000)]
+    buffer = "\n".join(tokens).encode()
+
+    start = time.perf_counter()
+    reference = [fsm_recognize_words(t) for t in tokens]
+    t_ref = time.perf_counter() - start
+
+    start = time.perf_counter()
+    compiled = recognize_lines(compiled_dfa, buffer)
+    t_new = time.perf_counter() - start
+
+    assert compiled == reference
+    print(f"fsm_recognize_words loop: {t_ref:.3f} sec")
+    print(f"recognize_lines:          {t_new:.3f} sec ({t_ref / t_new:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+import argparse
+import time
+
+import numpy as np
+
+from fsm_compiled import CompiledDFA, compiled_dfa
+from fsm_recognize_words import fsm_recognize_words
+
+# Vectorized batch mode: N words are packed into a padded matrix and all N
+# automata advance together, one column per step. The table gets one extra
+# "padding" class that maps every state to itself, so words shorter than the
+# matrix simply stop moving; the invalid state maps to itself on every class.
+
+
+def numpy_tables(dfa: CompiledDFA = compiled_dfa):
+    table = np.frombuffer(dfa.table, dtype=np.uint8).reshape(dfa.n_classes, dfa.n_states)
+    identity = np.arange(dfa.n_states, dtype=np.uint8)
+    table = np.vstack([table, identity])            # last class = padding
+    byte_class = np.frombuffer(dfa.byte_class, dtype=np.uint8)
+    accepting = np.zeros(dfa.n_states, dtype=bool)
+    accepting[list(dfa.accepting)] = True
+    return table, byte_class, accepting
+
+
+# Pack words into a (max_len, N) uint8 matrix of raw bytes plus a length vector.
+# The matrix is stored column-per-step so every step reads contiguous memory.
+def pack_words(words):
+    words = list(words)
+    joined = "".join(words) if all(isinstance(w, str) for w in words) else None
+    if joined is not None and joined.isascii():
+        # one encode for the whole batch, str lengths equal byte lengths
+        data = joined.encode("ascii")
+    else:
+        words = [w.encode("utf-8") if isinstance(w, str) else bytes(w) for w in words]
+        data = b"".join(words)
+    lengths = np.fromiter(map(len, words), dtype=np.int64, count=len(words))
+    max_len = int(lengths.max()) if len(words) else 0
+    matrix = np.zeros((max_len, len(words)), dtype=np.uint8)
+    flat = np.frombuffer(data, dtype=np.uint8)
+    rows = np.repeat(np.arange(len(words)), lengths)
+    starts = np.cumsum(lengths) - lengths
+    cols = np.arange(len(flat)) - np.repeat(starts, lengths)
+    matrix[cols, rows] = flat
+    return matrix, lengths
+
+
+def recognize_matrix(matrix, lengths, dfa: CompiledDFA = compiled_dfa) -> np.ndarray:
+    table, byte_class, accepting = numpy_tables(dfa)
+    pad = table.shape[0] - 1
+    classes = byte_class[matrix]
+    classes[np.arange(matrix.shape[0])[:, None] >= lengths[None, :]] = pad
+
+    state = np.full(matrix.shape[1], dfa.start, dtype=np.uint8)
+    for column in classes:
+        state = table[column, state]
+        if not (state != dfa.invalid).any():
+            break
+    return accepting[state]
+
+
+def recognize_batch(words, dfa: CompiledDFA = compiled_dfa) -> np.ndarray:
+    matrix, lengths = pack_words(words)
+    return recognize_matrix(matrix, lengths, dfa)
+
+
+def _make_words(n, rng):
+    n_bc = rng.integers(0, 8, n)
+    n_de = rng.integers(0, 6, n)
+    broken = rng.random(n) < 0.1
+    return ["a" + "bc" * int(b) + "d" + "de" * int(d) + ("d" if x else "")
+            for b, d, x in zip(n_bc, n_de, broken)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="NumPy batch evaluation of the lab01 FSM")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10**4, 10**5, 10**6])
+    args = parser.parse_args()
+
+    check = ["ad", "abcd", "abcbcd", "adde", "addede", "a", "abd", "ade",
+             "abccd", "abcdd", "abcbcded", "", "x", "aé", "ddddddddddd"]
+    assert recognize_batch(check).tolist() == [fsm_recognize_words(w) for w in check]
+    print("[INFO] batch mode matches fsm_recognize_words")
+
+    rng = np.random.default_rng(1)
+    print(f"{'N':>9} {'loop, s':>9} {'numpy, s':>9} {'words/s (numpy)':>16} {'speedup':>8}")
+    for n in args.sizes:
+        words = _make_words(n, rng)
+
+        start = time.perf_counter()
+        expected = [fsm_recognize_words(w) for w in words]
+        t_loop = time.perf_counter() - start
+
+        start = time.perf_counter()
+        got = recognize_batch(words)
+        t_numpy = time.perf_counter() - start
+
+        assert got.tolist() == expected
+        print(f"{n:>9} {t_loop:>9.3f} {t_numpy:>9.3f} {n / t_numpy:>16,.0f} {t_loop / t_numpy:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,254 @@
+from functools import lru_cache
+from itertools import product
+
+from fsm_compiled import CompiledDFA, compile_dfa, recognize_bytes
+from fsm_recognize_words import fsm_recognize_words, tobe_accepted, tobe_rejected
+
+# Pattern -> NFA -> DFA -> minimal DFA
+# Supported syntax: literal characters, concatenation, `*`, `|` and `( )`.
+# A backslash escapes the next character.
+
+LAB_PATTERN = "a(bc)*d(de)*"
+
+SPECIAL = "()*|\\"
+
+
+# ----- parser: pattern -> AST -----
+# AST nodes are tuples: ("eps",), ("chr", c), ("cat", l, r), ("alt", l, r), ("star", x)
+
+class _Parser:
+    def __init__(self, pattern: str):
+        self.pattern = pattern
+        self.pos = 0
+
+    def peek(self):
+        return self.pattern[self.pos] if self.pos < len(self.pattern) else None
+
+    def parse(self):
+        node = self.alternation()
+        if self.pos != len(self.pattern):
+            raise ValueError(f"unexpected {self.peek()!r} at {self.pos} in {self.pattern!r}")
+        return node
+
+    def alternation(self):
+        node = self.concatenation()
+        while self.peek() == "|":
+            self.pos += 1
+            node = ("alt", node, self.concatenation())
+        return node
+
+    def concatenation(self):
+        node = ("eps",)
+        while self.peek() is not None and self.peek() not in "|)":
+            item = self.repetition()
+            node = item if node == ("eps",) else ("cat", node, item)
+        return node
+
+    def repetition(self):
+        node = self.atom()
+        while self.peek() == "*":
+            self.pos += 1
+            node = ("star", node)
+        return node
+
+    def atom(self):
+        ch = self.peek()
+        if ch == "(":
+            self.pos += 1
+            node = self.alternation()
+            if self.peek() != ")":
+                raise ValueError(f"missing ')' in {self.pattern!r}")
+            self.pos += 1
+            return node
+        if ch == "*":
+            raise ValueError(f"'*' without operand at {self.pos} in {self.pattern!r}")
+        if ch == "\\":
+            self.pos += 1
+            ch = self.peek()
+            if ch is None:
+                raise ValueError(f"dangling escape in {self.pattern!r}")
+        self.pos += 1
+        return ("chr", ch)
+
+
+# ----- Thompson construction: AST -> NFA -----
+
+class _NFA:
+    def __init__(self):
+        self.eps = []       # eps[s] -> list of states
+        self.edges = []     # edges[s] -> list of (char, state)
+
+    def new_state(self) -> int:
+        self.eps.append([])
+        self.edges.append([])
+        return len(self.eps) - 1
+
+    def build(self, node):
+        kind = node[0]
+        start = self.new_state()
+        end = self.new_state()
+        if kind == "eps":
+            self.eps[start].append(end)
+        elif kind == "chr":
+            self.edges[start].append((node[1], end))
+        elif kind == "cat":
+            s1, e1 = self.build(node[1])
+            s2, e2 = self.build(node[2])
+            self.eps[start].append(s1)
+            self.eps[e1].append(s2)
+            self.eps[e2].append(end)
+        elif kind == "alt":
+            for sub in node[1:]:
+                s, e = self.build(sub)
+                self.eps[start].append(s)
+                self.eps[e].append(end)
+        elif kind == "star":
+            s, e = self.build(node[1])
+            self.eps[start] += [s, end]
+            self.eps[e] += [s, end]
+        return start, end
+
+
+def _closure(nfa: _NFA, states) -> frozenset:
+    stack = list(states)
+    seen = set(states)
+    while stack:
+        s = stack.pop()
+        for t in nfa.eps[s]:
+            if t not in seen:
+                seen.add(t)
+                stack.append(t)
+    return frozenset(seen)
+
+
+# ----- subset construction: NFA -> complete DFA (with an explicit dead state) -----
+
+def _determinize(nfa: _NFA, start: int, accept: int, alphabet):
+    first = _closure(nfa, [start])
+    index = {first: 0}
+    subsets = [first]
+    delta = []
+    i = 0
+    while i < len(subsets):
+        current = subsets[i]
+        row = {}
+        for ch in alphabet:
+            moved = [t for s in current for c, t in nfa.edges[s] if c == ch]
+            target = _closure(nfa, moved)
+            if target not in index:
+                index[target] = len(subsets)
+                subsets.append(target)
+            row[ch] = index[target]
+        delta.append(row)
+        i += 1
+    # the empty subset is the dead state; make sure it always exists
+    dead = index.get(frozenset())
+    if dead is None:
+        dead = len(subsets)
+        subsets.append(frozenset())
+        delta.append({ch: dead for ch in alphabet})
+    accepting = {i for i, sub in enumerate(subsets) if accept in sub}
+    return delta, accepting, dead
+
+
+# ----- Hopcroft minimization -----
+
+def _hopcroft(delta, accepting, alphabet):
+    n = len(delta)
+    inverse = {ch: [[] for _ in range(n)] for ch in alphabet}
+    for s, row in enumerate(delta):
+        for ch, t in row.items():
+            inverse[ch][t].append(s)
+
+    rejecting = set(range(n)) - accepting
+    partition = [block for block in (set(accepting), rejecting) if block]
+    work = [min(partition, key=len)] if len(partition) == 2 else []
+    while work:
+        splitter = work.pop()
+        for ch in alphabet:
+            preimage = {s for t in splitter for s in inverse[ch][t]}
+            if not preimage:
+                continue
+            refined = []
+            for block in partition:
+                inside = block & preimage
+                outside = block - preimage
+                if inside and outside:
+                    refined += [inside, outside]
+                    if block in work:
+                        work.remove(block)
+                        work += [inside, outside]
+                    else:
+                        work.append(min(inside, outside, key=len))
+                else:
+                    refined.append(block)
+            partition = refined
+    return partition
+
+
+def _minimal_dfa(pattern: str):
+    ast = _Parser(pattern).parse()
+    nfa = _NFA()
+    start, accept = nfa.build(ast)
+    alphabet = sorted({c for row in nfa.edges for c, _ in row})
+    delta, accepting, dead = _determinize(nfa, start, accept, alphabet)
+    partition = _hopcroft(delta, accepting, alphabet)
+
+    block_of = {s: i for i, block in enumerate(partition) for s in block}
+    # renumber blocks in BFS order from the start, dead block last
+    dead_block = block_of[dead]
+    order = [block_of[0]]
+    for b in order:
+        s = next(iter(partition[b]))
+        for ch in alphabet:
+            t = block_of[delta[s][ch]]
+            if t not in order and t != dead_block:
+                order.append(t)
+    order.append(dead_block)
+    new_id = {b: i for i, b in enumerate(order)}
+
+    transitions = {}
+    for b in order[:-1]:
+        s = next(iter(partition[b]))
+        transitions[new_id[b]] = {
+            ch: new_id[block_of[delta[s][ch]]]
+            for ch in alphabet if block_of[delta[s][ch]] != dead_block
+        }
+    accepted = {new_id[block_of[s]] for s in accepting}
+    return transitions, accepted, len(order) - 1, len(order)
+
+
+# Compile a pattern into a minimal dense automaton; compiled automata are cached
+@lru_cache(maxsize=128)
+def compile_pattern(pattern: str) -> CompiledDFA:
+    transitions, accepted, dead, n_states = _minimal_dfa(pattern)
+    return compile_dfa(transitions, accepted, start=0, invalid=dead,
+                       states=list(range(n_states)))
+
+
+def validate(pattern: str, word) -> bool:
+    return recognize_bytes(compile_pattern(pattern), word)
+
+
+def main():
+    print(f"Pattern FSM: {LAB_PATTERN}")
+    dfa = compile_pattern(LAB_PATTERN)
+    print(f"[INFO] minimal DFA has {dfa.n_states} states (including the dead state)")
+
+    for word in tobe_accepted:
+        assert validate(LAB_PATTERN, word), f"[Error] {word} should be accepted"
+    for word in tobe_rejected:
+        assert not validate(LAB_PATTERN, word), f"[Error] {word} should be rejected"
+    print("[INFO] tobe_accepted / tobe_rejected examples pass")
+
+    # exhaustive check against the hand-written table for short words
+    for length in range(8):
+        for letters in product("abcdex", repeat=length):
+            word = "".join(letters)
+            assert validate(LAB_PATTERN, word) == fsm_recognize_words(word), word
+    print("[INFO] generated automaton agrees with transition_table up to length 7")
+    print(f"[INFO] cache: {compile_pattern.cache_info()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -23,6 +23,10 @@ transition_table = {
     State.STATE_D_THEN_E:     {'e':State.STATE_DE_ACCEPT},
 }
 
+# Examples used as regression checks
+tobe_accepted = ["ad", "abcd", "abcbcd", "adde", "addede"]
+tobe_rejected = ["a", "abd", "ade", "abccd", "abcdd", "abcbcded"]
+
 # The function that recognizes the words
 def fsm_recognize_words(input_string) -> bool:
     current_state = State.STATE_START_IS_A
@@ -35,9 +39,6 @@ def fsm_recognize_words(input_string) -> bool:
 
 def main():
     print("Finite State Machine: Recognize Words")
-    #Examples
-    tobe_accepted = ["ad", "abcd", "abcbcd", "adde", "addede"]
-    tobe_rejected = ["a", "abd", "ade", "abccd", "abcdd", "abcbcded"]
 
     print("[INFO] Testing the FSM with some examples")
     print("[INFO] Accepted words:")
@@ -0,0 +1,241 @@
+import argparse
+import mmap
+import os
+import tempfile
+import time
+from dataclasses import dataclass, field
+from multiprocessing import Pool
+
+from fsm_compiled import CompiledDFA, compiled_dfa
+from fsm_recognize_words import State, accepted_state, fsm_recognize_words, transition_table
+
+# Parallel scan of a big newline-delimited file (one word per line).
+# Every chunk is scanned independently. The part of the chunk before its first
+# newline belongs to a line that started in an earlier chunk, so for that part
+# the worker computes a transfer vector: the end state (and the first failing
+# offset) for every possible start state. Composing the chunks in file order
+# then gives exactly the result of one sequential pass.
+
+
+@dataclass
+class ChunkResult:
+    begin: int
+    end: int
+    has_newline: bool
+    head_state: tuple       # head_state[s] -> state after the head fragment
+    head_fail: tuple        # head_fail[s] -> absolute offset of failure or -1
+    head_end: int           # offset of the first newline (or chunk end)
+    accepted: int = 0
+    rejected: int = 0
+    failures: list = field(default_factory=list)
+    tail_state: int = 0
+    tail_fail: int = -1
+    tail_len: int = 0
+
+
+@dataclass
+class ScanResult:
+    accepted: int
+    rejected: int
+    failures: list          # byte offsets where the first rejected lines fail
+
+    @property
+    def records(self) -> int:
+        return self.accepted + self.rejected
+
+    @property
+    def all_accepted(self) -> bool:
+        return self.rejected == 0
+
+
+def _run(rows, invalid, state, data):
+    for i, b in enumerate(data):
+        state = rows[state][b]
+        if state == invalid:
+            return state, i
+    return state, -1
+
+
+def scan_chunk(path, begin, end, dfa: CompiledDFA = compiled_dfa, max_failures=10) -> ChunkResult:
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        data = mm[begin:end]
+    rows, invalid, accepting = dfa.rows, dfa.invalid, dfa.accepting
+
+    first_nl = data.find(b"\n")
+    head = data if first_nl < 0 else data[:first_nl]
+    head_state, head_fail = [], []
+    for s in range(dfa.n_states):
+        st, fail = _run(rows, invalid, s, head)
+        head_state.append(st)
+        head_fail.append(begin + fail if fail >= 0 else -1)
+    result = ChunkResult(begin, end, first_nl >= 0, tuple(head_state), tuple(head_fail),
+                         begin + len(head))
+    if first_nl < 0:
+        return result
+
+    last_nl = data.rfind(b"\n")
+    pos = begin + first_nl + 1
+    if last_nl > first_nl:
+        for line in data[first_nl + 1:last_nl].split(b"\n"):
+            st, fail = _run(rows, invalid, dfa.start, line)
+            if st in accepting:
+                result.accepted += 1
+            else:
+                result.rejected += 1
+                if len(result.failures) < max_failures:
+                    result.failures.append(pos + fail if fail >= 0 else pos + len(line))
+            pos += len(line) + 1
+
+    tail = data[last_nl + 1:]
+    st, fail = _run(rows, invalid, dfa.start, tail)
+    result.tail_state = st
+    result.tail_fail = begin + last_nl + 1 + fail if fail >= 0 else -1
+    result.tail_len = len(tail)
+    return result
+
+
+def _scan_chunk_args(args):
+    return scan_chunk(*args)
+
+
+# Fold the chunk results in file order
+def compose(results, size, dfa: CompiledDFA = compiled_dfa, max_failures=10) -> ScanResult:
+    accepted = rejected = 0
+    failures = []
+    state, fail, pending = dfa.start, -1, 0
+
+    def close(end_state, fail_at, end_pos):
+        nonlocal accepted, rejected
+        if end_state in dfa.accepting:
+            accepted += 1
+        else:
+            rejected += 1
+            failures.append(fail_at if fail_at >= 0 else end_pos)
+
+    for r in results:
+        if fail < 0:
+            fail = r.head_fail[state]
+        state = r.head_state[state]
+        if not r.has_newline:
+            pending += r.end - r.begin
+            continue
+        close(state, fail, r.head_end)
+        accepted += r.accepted
+        rejected += r.rejected
+        failures += r.failures
+        state, fail, pending = r.tail_state, r.tail_fail, r.tail_len
+    if pending > 0:
+        close(state, fail, size)
+    return ScanResult(accepted, rejected, failures[:max_failures])
+
+
+def scan_file(path, workers=None, chunk_size=None, dfa: CompiledDFA = compiled_dfa,
+              max_failures=10) -> ScanResult:
+    workers = workers or os.cpu_count() or 1
+    size = os.path.getsize(path)
+    if chunk_size is None:
+        chunk_size = max(1 << 16, -(-size // (workers * 4)))
+    tasks = [(path, begin, min(begin + chunk_size, size), dfa, max_failures)
+             for begin in range(0, size, chunk_size)]
+    if workers == 1:
+        results = map(_scan_chunk_args, tasks)
+        return compose(results, size, dfa, max_failures)
+    with Pool(workers) as pool:
+        return compose(pool.imap(_scan_chunk_args, tasks), size, dfa, max_failures)
+
+
+# Straightforward sequential scan on transition_table, used as the reference
+def scan_reference(path, max_failures=10) -> ScanResult:
+    accepted = rejected = 0
+    failures = []
+    pos = 0
+    with open(path, "rb") as f:
+        data = f.read()
+    lines = data.split(b"\n")
+    if data.endswith(b"\n"):
+        lines.pop()
+    for line in lines:
+        word = line.decode("latin-1")
+        state = State.STATE_START_IS_A
+        fail = len(word)
+        for i, ch in enumerate(word):
+            state = transition_table.get(state, {}).get(ch, State.STATE_INVALID)
+            if state == State.STATE_INVALID:
+                fail = i
+                break
+        if state in accepted_state:
+            accepted += 1
+        else:
+            rejected += 1
+            failures.append(pos + fail)
+        pos += len(line) + 1
+    return ScanResult(accepted, rejected, failures[:max_failures])
+
+
+def _write_sample(path, n_lines):
+    with open(path, "w") as f:
+        for i in range(n_lines):
+            word = "a" + "bc" * (i % 13) + "d" + "de" * (i % 7)
+            if i % 997 == 0:
+                word += "x"
+            f.write(word + "\n")
+
+
+# The result must not depend on how the file is cut into chunks
+def _self_check(workers):
+    words = ["", "ad", "", "abcbcdde", "abx", "abcbcbcbcbcbcbcbcbcbcbcd"]
+    words += ["a" + "bc" * (i % 13) + "d" + "de" * (i % 7) + ("e" if i % 17 == 0 else "")
+              for i in range(300)]
+    for ending in ("\n", ""):
+        with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as f:
+            f.write("\n".join(words + ["abcbcbc"]) + ending)
+        try:
+            reference = scan_reference(f.name, max_failures=50)
+            for chunk in (1, 3, 7, 64, 4096, None):
+                got = scan_file(f.name, workers=workers, chunk_size=chunk, max_failures=50)
+                assert got == reference, chunk
+        finally:
+            os.unlink(f.name)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parallel chunked scan with the lab01 FSM")
+    parser.add_argument("path", nargs="?", help="newline-delimited file (default: generated sample)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--chunk-size", type=int, default=None)
+    parser.add_argument("--lines", type=int, default=500_000, help="size of the generated sample")
+    args = parser.parse_args()
+
+    tmp = None
+    path = args.path
+    if path is None:
+        tmp = tempfile.NamedTemporaryFile(suffix=".txt", delete=False)
+        tmp.close()
+        path = tmp.name
+        _write_sample(path, args.lines)
+
+    try:
+        _self_check(args.workers)
+        print("[INFO] chunked scan matches the sequential reference")
+
+        start = time.perf_counter()
+        with open(path) as f:
+            baseline = sum(1 for line in f if fsm_recognize_words(line.rstrip("\n")))
+        t_loop = time.perf_counter() - start
+
+        start = time.perf_counter()
+        result = scan_file(path, workers=args.workers, chunk_size=args.chunk_size)
+        t_scan = time.perf_counter() - start
+
+        assert result.accepted == baseline
+        print(f"records: {result.records}, accepted: {result.accepted}, rejected: {result.rejected}")
+        print(f"first failures at offsets: {result.failures}")
+        print(f"fsm_recognize_words loop: {t_loop:.3f} sec")
+        print(f"scan_file ({args.workers} workers): {t_scan:.3f} sec ({t_loop / t_scan:.1f}x)")
+    finally:
+        if tmp is not None:
+            os.unlink(path)
+
+
+if __name__ == "__main__":
+    main()
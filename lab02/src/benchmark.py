@@ -0,0 +1,158 @@
+import argparse
+import csv
+import itertools
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from game_tree import generate_game_tree
+from implicit_tree import generate_implicit_tree
+from minimax import minimax
+from minimax_ab_pruning import minimax_ab_pruning
+from search_engine import ENGINES
+
+# Benchmark runner for the lab02 engines.
+# Every (engine, depth, branching, seed) configuration is run `warmup` times
+# untimed, then `repeats` times timed; one more run under tracemalloc gives the
+# peak memory of the search itself (kept separate because tracing slows the
+# search down; the tree is built before tracing starts).
+# pruning_ratio = 1 - nodes / nodes in the full tree (re-searches can make it negative).
+
+
+# The original recursive functions on Node trees; counters are reset per run
+def _run_minimax(root, depth, player):
+    minimax.counter = 0
+    value = minimax(root, depth, player)
+    return value, minimax.counter
+
+
+def _run_minimax_ab_pruning(root, depth, player):
+    minimax_ab_pruning.counter = 0
+    value = minimax_ab_pruning(root, depth, player)
+    return value, minimax_ab_pruning.counter
+
+
+NODE_ENGINES = {
+    "node_minimax": _run_minimax,
+    "node_minimax_ab_pruning": _run_minimax_ab_pruning,
+}
+
+
+def _make_runner(engine, depth, branching, seed, player):
+    if engine in NODE_ENGINES:
+        np.random.seed(seed)
+        root = generate_game_tree(depth, branching)
+        fn = NODE_ENGINES[engine]
+        return lambda: fn(root, depth, player)
+    tree = generate_implicit_tree(depth, branching, seed)
+    fn = ENGINES[engine]
+
+    def run():
+        stats = fn(tree, player)
+        return stats.value, stats.nodes
+    return run
+
+
+def _iqr(samples):
+    if len(samples) < 2:
+        return 0.0
+    q1, _, q3 = statistics.quantiles(samples, n=4)
+    return q3 - q1
+
+
+def bench_config(engine, depth, branching, seed, player="MIN", repeats=5, warmup=1) -> dict:
+    run = _make_runner(engine, depth, branching, seed, player)
+    for _ in range(warmup):
+        run()
+
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        value, nodes = run()
+        times.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    run()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    total_nodes = (branching ** depth - 1) // (branching - 1)
+    return {
+        "engine": engine,
+        "depth": depth,
+        "branching": branching,
+        "seed": seed,
+        "player": player,
+        "repeats": repeats,
+        "value": value,
+        "nodes": nodes,
+        "time_median": statistics.median(times),
+        "time_iqr": _iqr(times),
+        "peak_memory": peak,
+        "pruning_ratio": 1 - nodes / total_nodes,
+    }
+
+
+def sweep(engines, depths, branchings, seeds, **kwargs):
+    rows = []
+    for depth, branching, seed in itertools.product(depths, branchings, seeds):
+        for engine in engines:
+            rows.append(bench_config(engine, depth, branching, seed, **kwargs))
+    return rows
+
+
+def write_json(path, rows):
+    meta = {
+        "python": sys.version.split()[0],
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+    with open(path, "w") as f:
+        json.dump({"meta": meta, "results": rows}, f, indent=2)
+
+
+def write_csv(path, rows):
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def main():
+    all_engines = list(NODE_ENGINES) + list(ENGINES)
+    parser = argparse.ArgumentParser(description="Parameter sweep over the lab02 search engines")
+    parser.add_argument("--engines", nargs="+", choices=all_engines, default=all_engines)
+    parser.add_argument("--depths", type=int, nargs="+", default=[6, 8, 10])
+    parser.add_argument("--branchings", type=int, nargs="+", default=[2, 3])
+    parser.add_argument("--seeds", type=int, nargs="+", default=[1, 2, 3])
+    parser.add_argument("--player", choices=["MAX", "MIN"], default="MIN")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--json", help="write results to this JSON file")
+    parser.add_argument("--csv", help="write results to this CSV file")
+    args = parser.parse_args()
+
+    rows = sweep(args.engines, args.depths, args.branchings, args.seeds,
+                 player=args.player, repeats=args.repeats, warmup=args.warmup)
+
+    print(f"{'engine':<24} {'d':>3} {'b':>3} {'seed':>4} {'value':>6} {'nodes':>9} "
+          f"{'median, s':>10} {'IQR, s':>9} {'peak, KiB':>10} {'pruned':>7}")
+    for r in rows:
+        print(f"{r['engine']:<24} {r['depth']:>3} {r['branching']:>3} {r['seed']:>4} {r['value']:>6} "
+              f"{r['nodes']:>9} {r['time_median']:>10.6f} {r['time_iqr']:>9.6f} "
+              f"{r['peak_memory'] / 1024:>10.1f} {r['pruning_ratio'] * 100:>6.1f}%")
+
+    if args.json:
+        write_json(args.json, rows)
+    if args.csv:
+        write_csv(args.csv, rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,226 @@
+import argparse
+import time
+from dataclasses import dataclass, field
+
+from games import GAMES
+
+# Alpha-beta for real games (see games.py): iterative deepening with a
+# Zobrist-keyed transposition table, killer moves and the history heuristic.
+# Killers, history and the table survive from one deepening iteration to the
+# next, which is where the move ordering comes from.
+
+EXACT, LOWER, UPPER = 0, 1, 2
+
+
+# Same algorithm as minimax_ab_pruning (fixed move order, nothing remembered),
+# written in negamax form for the game interface. Used as the baseline.
+def plain_alphabeta(game, state, depth, alpha=float("-inf"), beta=float("inf"), counter=None):
+    if counter is not None:
+        counter[0] += 1
+    if depth == 0 or game.is_terminal(state):
+        return game.evaluate(state)
+    best_value = float("-inf")
+    for move in game.legal_moves(state):
+        eval = -plain_alphabeta(game, game.apply(state, move), depth - 1, -beta, -alpha, counter)
+        best_value = max(best_value, eval)
+        alpha = max(alpha, eval)
+        if beta <= alpha:
+            break
+    return best_value
+
+
+class TranspositionTable:
+    """Fixed number of slots indexed by the low bits of the Zobrist key.
+
+    Replacement: an entry is overwritten by the same position, by anything if
+    it was written during an earlier search, and otherwise only by a result
+    searched at least as deep (depth-preferred).
+    """
+
+    def __init__(self, size_log2=16):
+        self.mask = (1 << size_log2) - 1
+        self.slots = [None] * (1 << size_log2)
+        self.generation = 0
+        self.stores = 0
+        self.replacements = 0
+
+    def probe(self, key):
+        entry = self.slots[key & self.mask]
+        if entry is not None and entry[0] == key:
+            return entry
+        return None
+
+    # entry = (key, depth, value, flag, move, generation)
+    def store(self, key, depth, value, flag, move):
+        i = key & self.mask
+        old = self.slots[i]
+        if old is not None and old[0] != key:
+            if old[5] == self.generation and old[1] > depth:
+                return
+            self.replacements += 1
+        self.slots[i] = (key, depth, value, flag, move, self.generation)
+        self.stores += 1
+
+    def new_search(self):
+        self.generation += 1
+
+
+@dataclass
+class IDResult:
+    value: float
+    best_move: int
+    depth: int
+    nodes: int
+    nodes_per_iteration: list = field(default_factory=list)
+    tt_hits: int = 0
+    tt_cutoffs: int = 0
+    elapsed: float = 0.0
+
+
+class IterativeDeepeningSearch:
+    def __init__(self, game, use_tt=True, use_ordering=True, tt_size_log2=16):
+        self.game = game
+        self.use_ordering = use_ordering
+        self.tt = TranspositionTable(tt_size_log2) if use_tt else None
+        self.killers = {}       # ply -> [move, move]
+        self.history = {}       # (player, move) -> score
+
+    def search(self, state, max_depth) -> IDResult:
+        start = time.perf_counter()
+        if self.tt is not None:
+            self.tt.new_search()
+        # old history is still useful but should not dominate
+        self.history = {k: v // 2 for k, v in self.history.items()}
+        self.tt_hits = self.tt_cutoffs = 0
+        result = IDResult(float("-inf"), None, 0, 0)
+        best_move = None
+        for depth in range(1, max_depth + 1):
+            self.nodes = 0
+            value, best_move = self._root(state, depth, best_move)
+            result.nodes_per_iteration.append(self.nodes)
+            result.value, result.best_move, result.depth = value, best_move, depth
+        result.nodes = sum(result.nodes_per_iteration)
+        result.tt_hits, result.tt_cutoffs = self.tt_hits, self.tt_cutoffs
+        result.elapsed = time.perf_counter() - start
+        return result
+
+    def _order(self, state, moves, first, ply):
+        if not self.use_ordering:
+            if first in moves:
+                moves.remove(first)
+                moves.insert(0, first)
+            return moves
+        killers = self.killers.get(ply, ())
+        player = state.player
+
+        def score(move):
+            if move == first:
+                return 1 << 40
+            if move in killers:
+                return 1 << 30
+            return self.history.get((player, move), 0)
+
+        return sorted(moves, key=score, reverse=True)
+
+    def _root(self, state, depth, previous_best):
+        self.nodes += 1
+        moves = self._order(state, self.game.legal_moves(state), previous_best, 0)
+        alpha, beta = float("-inf"), float("inf")
+        best_move = moves[0] if moves else None
+        for move in moves:
+            value = -self._negamax(self.game.apply(state, move), depth - 1, -beta, -alpha, 1)
+            if value > alpha:
+                alpha, best_move = value, move
+        if self.tt is not None:
+            self.tt.store(state.key, depth, alpha, EXACT, best_move)
+        return alpha, best_move
+
+    def _negamax(self, state, depth, alpha, beta, ply):
+        self.nodes += 1
+        game = self.game
+        tt_move = None
+        if self.tt is not None:
+            entry = self.tt.probe(state.key)
+            if entry is not None:
+                self.tt_hits += 1
+                _, entry_depth, value, flag, tt_move, _ = entry
+                if entry_depth >= depth and (
+                    flag == EXACT
+                    or (flag == LOWER and value >= beta)
+                    or (flag == UPPER and value <= alpha)
+                ):
+                    self.tt_cutoffs += 1
+                    return value
+
+        if depth == 0 or game.is_terminal(state):
+            return game.evaluate(state)
+
+        alpha_orig = alpha
+        best_value, best_move = float("-inf"), None
+        for move in self._order(state, game.legal_moves(state), tt_move, ply):
+            value = -self._negamax(game.apply(state, move), depth - 1, -beta, -alpha, ply + 1)
+            if value > best_value:
+                best_value, best_move = value, move
+            if value > alpha:
+                alpha = value
+            if alpha >= beta:
+                if self.use_ordering:
+                    killers = self.killers.setdefault(ply, [])
+                    if move not in killers:
+                        killers.insert(0, move)
+                        del killers[2:]
+                    key = (state.player, move)
+                    self.history[key] = self.history.get(key, 0) + depth * depth
+                break
+
+        if self.tt is not None:
+            if best_value <= alpha_orig:
+                flag = UPPER
+            elif best_value >= beta:
+                flag = LOWER
+            else:
+                flag = EXACT
+            self.tt.store(state.key, depth, best_value, flag, best_move)
+        return best_value
+
+
+def compare(game, state, depth):
+    rows = []
+    counter = [0]
+    start = time.perf_counter()
+    value = plain_alphabeta(game, state, depth, counter=counter)
+    rows.append(("alphabeta (fixed order)", value, counter[0], time.perf_counter() - start))
+    for name, use_tt, use_ordering in (
+        ("ID", False, False),
+        ("ID + killers/history", False, True),
+        ("ID + TT", True, False),
+        ("ID + TT + killers/history", True, True),
+    ):
+        result = IterativeDeepeningSearch(game, use_tt, use_ordering).search(state, depth)
+        rows.append((name, result.value, result.nodes, result.elapsed))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Alpha-beta with TT and move ordering on real games")
+    parser.add_argument("--game", choices=list(GAMES), nargs="+", default=list(GAMES))
+    parser.add_argument("--depth", type=int, default=None, help="default: 9 for tic-tac-toe, 6 for connect four")
+    parser.add_argument("--moves", type=int, nargs="*", default=[], help="opening moves to play first")
+    args = parser.parse_args()
+
+    for name in args.game:
+        game = GAMES[name]()
+        state = game.initial_state()
+        for move in args.moves:
+            state = game.apply(state, move)
+        depth = args.depth or (9 if name == "tictactoe" else 6)
+        rows = compare(game, state, depth)
+        baseline = rows[0][2]
+        print(f"{game.name}, depth {depth}")
+        print(f"  {'engine':<28} {'value':>6} {'nodes':>9} {'vs baseline':>12} {'time, s':>9}")
+        for engine, value, nodes, elapsed in rows:
+            print(f"  {engine:<28} {value:>6} {nodes:>9} {nodes / baseline * 100:>11.1f}% {elapsed:>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -14,7 +14,7 @@ def build_weighted_tree(current_depth,max_depth,max_children_per_node,values):
     if current_depth > max_depth:
         return None
 
-    value = values.pop(0) if current_depth == max_depth else None
+    value = next(values) if current_depth == max_depth else None
     player = "MAX" if current_depth % 2 == 0 else "MIN"
     node = Node(value,player)
 
@@ -40,5 +40,5 @@ def print_tree(node, prefix="", is_last=True):
 def generate_game_tree(max_depth,max_children_per_node):
     shape = (1,pow(max_children_per_node,max_depth-1))
     values = np.random.randint(1,100, size=shape)[0].tolist()
-    root = build_weighted_tree(1, max_depth, max_children_per_node,values)
+    root = build_weighted_tree(1, max_depth, max_children_per_node,iter(values))
     return root
\ No newline at end of file
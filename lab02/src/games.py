@@ -0,0 +1,162 @@
+import random
+from collections import namedtuple
+
+# Real two-player games for the search engines.
+# A game object has:
+#   initial_state()          -> state
+#   legal_moves(state)       -> list of moves (small ints)
+#   apply(state, move)       -> new state
+#   is_terminal(state)       -> bool
+#   evaluate(state)          -> score for the player to move (negamax convention)
+# Every state carries a Zobrist key (state.key) that apply() updates incrementally.
+
+WIN_SCORE = 1000
+
+# board: tuple of cells (0 empty, 1 / 2 players), player: side to move,
+# key: Zobrist hash, last: last move (None at the start)
+GameState = namedtuple("GameState", "board player key last")
+
+
+class ZobristGame:
+    def __init__(self, cells, seed=2024):
+        rng = random.Random(seed)
+        # keys[cell][player]; index 0 is unused (empty cells do not hash)
+        self.keys = [[0] + [rng.getrandbits(64) for _ in range(2)] for _ in range(cells)]
+        self.side_key = rng.getrandbits(64)
+        self.cells = cells
+
+    def initial_state(self):
+        return GameState((0,) * self.cells, 1, 0, None)
+
+    def _place(self, state, cell):
+        board = list(state.board)
+        board[cell] = state.player
+        key = state.key ^ self.keys[cell][state.player] ^ self.side_key
+        return GameState(tuple(board), 3 - state.player, key, cell)
+
+
+# ----- Tic-tac-toe -----
+
+TTT_LINES = [
+    (0, 1, 2), (3, 4, 5), (6, 7, 8),
+    (0, 3, 6), (1, 4, 7), (2, 5, 8),
+    (0, 4, 8), (2, 4, 6),
+]
+
+
+class TicTacToe(ZobristGame):
+    name = "tic-tac-toe"
+
+    def __init__(self):
+        super().__init__(9)
+
+    def legal_moves(self, state):
+        if self.winner(state):
+            return []
+        return [i for i, c in enumerate(state.board) if c == 0]
+
+    def apply(self, state, move):
+        return self._place(state, move)
+
+    def winner(self, state):
+        b = state.board
+        for x, y, z in TTT_LINES:
+            if b[x] and b[x] == b[y] == b[z]:
+                return b[x]
+        return 0
+
+    def is_terminal(self, state):
+        return self.winner(state) != 0 or 0 not in state.board
+
+    def evaluate(self, state):
+        won = self.winner(state)
+        if won:
+            return WIN_SCORE if won == state.player else -WIN_SCORE
+        # lines still open for the side to move minus lines open for the opponent
+        me, other = state.player, 3 - state.player
+        score = 0
+        for line in TTT_LINES:
+            cells = [state.board[i] for i in line]
+            if other not in cells:
+                score += 1
+            if me not in cells:
+                score -= 1
+        return score
+
+
+# ----- Connect four -----
+
+C4_COLS = 7
+C4_ROWS = 6
+
+
+def _c4_windows():
+    windows = []
+    for r in range(C4_ROWS):
+        for c in range(C4_COLS):
+            for dr, dc in ((0, 1), (1, 0), (1, 1), (1, -1)):
+                cells = [(r + i * dr, c + i * dc) for i in range(4)]
+                if all(0 <= rr < C4_ROWS and 0 <= cc < C4_COLS for rr, cc in cells):
+                    windows.append(tuple(rr * C4_COLS + cc for rr, cc in cells))
+    return windows
+
+
+C4_WINDOWS = _c4_windows()
+C4_WINDOWS_BY_CELL = [[w for w in C4_WINDOWS if cell in w] for cell in range(C4_ROWS * C4_COLS)]
+
+
+class ConnectFour(ZobristGame):
+    name = "connect-four"
+
+    def __init__(self):
+        super().__init__(C4_ROWS * C4_COLS)
+
+    # row 0 is the bottom row, cell = row * C4_COLS + col
+    def legal_moves(self, state):
+        if self.last_move_won(state):
+            return []
+        top = (C4_ROWS - 1) * C4_COLS
+        return [c for c in range(C4_COLS) if state.board[top + c] == 0]
+
+    def apply(self, state, move):
+        for row in range(C4_ROWS):
+            cell = row * C4_COLS + move
+            if state.board[cell] == 0:
+                return self._place(state, cell)
+        raise ValueError(f"column {move} is full")
+
+    def last_move_won(self, state):
+        if state.last is None:
+            return False
+        who = state.board[state.last]
+        b = state.board
+        return any(b[w[0]] == b[w[1]] == b[w[2]] == b[w[3]] == who
+                   for w in C4_WINDOWS_BY_CELL[state.last])
+
+    def is_terminal(self, state):
+        return self.last_move_won(state) or 0 not in state.board
+
+    def evaluate(self, state):
+        if self.last_move_won(state):
+            return -WIN_SCORE          # the previous player has just won
+        me, other = state.player, 3 - state.player
+        b = state.board
+        score = 0
+        for w in C4_WINDOWS:
+            cells = [b[i] for i in w]
+            mine, theirs = cells.count(me), cells.count(other)
+            if theirs == 0:
+                score += (0, 1, 4, 16, 0)[mine]
+            elif mine == 0:
+                score -= (0, 1, 4, 16, 0)[theirs]
+        center = C4_COLS // 2
+        for row in range(C4_ROWS):
+            c = b[row * C4_COLS + center]
+            score += 3 if c == me else -3 if c == other else 0
+        return score
+
+
+GAMES = {
+    "tictactoe": TicTacToe,
+    "connect4": ConnectFour,
+}
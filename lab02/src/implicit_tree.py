@@ -0,0 +1,74 @@
+import numpy as np
+
+# Complete game tree without Node objects.
+# Only the leaf values are stored, as one flat array. Node `index` on level
+# `level` (root = level 0, index 0) has the children
+# index*branching .. index*branching + branching-1 on level + 1.
+# `depth` counts levels the same way as generate_game_tree, so the leaves are
+# on level depth-1 and there are branching**(depth-1) of them.
+
+
+class ImplicitTree:
+    def __init__(self, leaves, branching, depth, seed=None):
+        if len(leaves) != branching ** (depth - 1):
+            raise ValueError(f"expected {branching ** (depth - 1)} leaves, got {len(leaves)}")
+        self.leaves = leaves
+        self.branching = branching
+        self.depth = depth
+        self.seed = seed
+
+    def leaf_value(self, index):
+        return int(self.leaves[index])
+
+    def children(self, index):
+        first = index * self.branching
+        return range(first, first + self.branching)
+
+    def node_count(self):
+        return (self.branching ** self.depth - 1) // (self.branching - 1)
+
+
+# Same random values as generate_game_tree for the same seed
+def generate_implicit_tree(max_depth, max_children_per_node, seed=1):
+    rng = np.random.RandomState(seed)
+    leaves = rng.randint(1, 100, size=max_children_per_node ** (max_depth - 1))
+    return ImplicitTree(leaves, max_children_per_node, max_depth, seed)
+
+
+def other_player(player_name):
+    return "MIN" if player_name == "MAX" else "MAX"
+
+
+# Plain minimax as a bottom-up reduction: one reshape + max/min per level
+def minimax_levels(tree, player_name):
+    values = np.asarray(tree.leaves)
+    for level in range(tree.depth - 2, -1, -1):
+        player = player_name if level % 2 == 0 else other_player(player_name)
+        values = values.reshape(-1, tree.branching)
+        values = values.max(axis=1) if player == "MAX" else values.min(axis=1)
+    return int(values[0])
+
+
+# Alpha-beta over node indices; the tree is only read, so it can be shared
+def alphabeta_implicit(tree, player_name, level=0, index=0, alpha=float("-inf"), beta=float("inf")):
+    if level == tree.depth - 1:
+        return tree.leaf_value(index)
+
+    if player_name == "MAX":
+        best_value = float("-inf")
+        for child in tree.children(index):
+            eval = alphabeta_implicit(tree, "MIN", level + 1, child, alpha, beta)
+            best_value = max(best_value, eval)
+            alpha = max(alpha, eval)
+            if beta <= alpha:
+                break
+        return best_value
+    else:
+        best_value = float("inf")
+        for child in tree.children(index):
+            eval = alphabeta_implicit(tree, "MAX", level + 1, child, alpha, beta)
+            best_value = min(best_value, eval)
+            beta = min(beta, eval)
+            if beta <= alpha:
+                break
+        return best_value
@@ -0,0 +1,66 @@
+import argparse
+import time
+
+from implicit_tree import alphabeta_implicit
+
+# Game tree that never exists in memory.
+# A leaf value is a hash of (seed, leaf index), so it is the same every time
+# it is asked for, and nothing is computed for subtrees the search skips.
+# Same interface as ImplicitTree: branching, depth, leaf_value(), children().
+
+MASK64 = (1 << 64) - 1
+
+
+def splitmix64(x):
+    x = (x + 0x9E3779B97F4A7C15) & MASK64
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & MASK64
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & MASK64
+    return x ^ (x >> 31)
+
+
+class LazyTree:
+    def __init__(self, branching, depth, seed=1, low=1, high=100):
+        self.branching = branching
+        self.depth = depth
+        self.seed = seed
+        self.low = low
+        self.span = high - low
+        self._key = splitmix64(seed)
+        self.leaves_generated = 0
+
+    # value in [low, high), like np.random.randint(low, high)
+    def leaf_value(self, index):
+        self.leaves_generated += 1
+        return self.low + splitmix64(self._key ^ index) % self.span
+
+    def children(self, index):
+        first = index * self.branching
+        return range(first, first + self.branching)
+
+    def node_count(self):
+        return (self.branching ** self.depth - 1) // (self.branching - 1)
+
+    def leaf_count(self):
+        return self.branching ** (self.depth - 1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Alpha-beta on lazily generated trees")
+    parser.add_argument("--branching", type=int, default=3)
+    parser.add_argument("--depths", type=int, nargs="+", default=[8, 12, 16, 20])
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    player = "MIN"
+
+
+    print(f"{'depth':>5} {'leaves in tree':>16} {'leaves visited':>15} {'value':>6} {'time, s':>8}")
+    for depth in args.depths:
+        tree = LazyTree(args.branching, depth, args.seed)
+        start = time.perf_counter()
+        value = alphabeta_implicit(tree, player)
+        elapsed = time.perf_counter() - start
+        print(f"{depth:>5} {tree.leaf_count():>16,} {tree.leaves_generated:>15,} {value:>6} {elapsed:>8.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,45 +1,55 @@
-from game_tree import generate_game_tree, print_tree
-from minimax import minimax
-from minimax_ab_pruning import minimax_ab_pruning
+from implicit_tree import generate_implicit_tree, minimax_levels
+from search_engine import ENGINES, format_stats
+from tree_io import load_tree, save_tree
 
-import copy
+import argparse
 import time
 
 def main():
-    tree_depth = 12
-    children_per_node = 3
-    player = "MIN"
-
-    root_minimax = generate_game_tree(tree_depth,children_per_node)
-    root_minimax_ab_pruning = copy.deepcopy(root_minimax)
-    # print("Initial tree:")
-    # print_tree(root_minimax)
+    parser = argparse.ArgumentParser(description="Game tree search engines")
+    parser.add_argument("--engine", choices=list(ENGINES) + ["all"], nargs="+", default=["all"])
+    parser.add_argument("--depth", type=int, default=12)
+    parser.add_argument("--branching", type=int, default=3)
+    parser.add_argument("--player", choices=["MAX", "MIN"], default="MIN")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--verbose", action="store_true", help="print nodes and cutoffs per depth")
+    parser.add_argument("--save", metavar="PATH", help="write the generated tree to a tree file")
+    parser.add_argument("--load", metavar="PATH", help="memory-map a tree file instead of generating one")
+    args = parser.parse_args()
+
+    player = args.player
+    engines = list(ENGINES) if "all" in args.engine else args.engine
+
+    # One flat leaf array, read by every algorithm, no copies
+    if args.load:
+        tree = load_tree(args.load)
+        print(f"Loaded {args.load}: depth {tree.depth}, branching {tree.branching}, seed {tree.seed}")
+    else:
+        tree = generate_implicit_tree(args.depth,args.branching,args.seed)
+    if args.save:
+        save_tree(args.save, tree)
 
-    # MiniMax
+    # MiniMax as a level-by-level reduction
     start = time.perf_counter()
-    best_value_minimax = minimax(root_minimax, tree_depth, player)
+    best_value_levels = minimax_levels(tree, player)
     end = time.perf_counter()
-    t_minimax = end - start
-    print(f"MiniMax best value: {best_value_minimax}, time: {t_minimax:.6f} sec")
+    print(f"MiniMax (levels) best value: {best_value_levels}, time: {end - start:.6f} sec")
 
-    # MiniMax with alpha-beta pruning
-    start = time.perf_counter()
-    best_value_ab = minimax_ab_pruning(root_minimax_ab_pruning, tree_depth, player)
-    end = time.perf_counter()
-    t_ab = end - start
-    print(f"Alpha-Beta best value: {best_value_ab}, time: {t_ab:.6f} sec")
+    results = [ENGINES[name](tree, player) for name in engines]
+    if args.verbose:
+        for stats in results:
+            print(format_stats(stats))
 
-    if t_minimax > 0:
-        speedup = abs((t_minimax - t_ab) / t_minimax * 100)
-        print(f"Alpha-Beta is faster by {speedup:.2f}%")
-    else:
-        print("Timing error: minimax duration is 0")
+    baseline = results[0]
+    print(f"{'engine':<10} {'value':>6} {'nodes':>9} {'time, s':>10} {'nodes/sec':>12} {'nodes vs ' + baseline.engine:>16}")
+    for stats in results:
+        print(f"{stats.engine:<10} {stats.value:>6} {stats.nodes:>9} {stats.elapsed:>10.6f} "
+              f"{stats.nodes_per_second:>12,.0f} {stats.nodes / baseline.nodes * 100:>15.2f}%")
 
-    print("minimax times called")
-    print(minimax.counter)
-    print("minimax ab pruning times called")
-    print(minimax_ab_pruning.counter)
+    values = {stats.value for stats in results} | {best_value_levels}
+    if len(values) != 1:
+        print(f"[Error] engines disagree: {values}")
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,160 @@
+import argparse
+import time
+from dataclasses import dataclass
+from multiprocessing import Pool, RawValue
+
+from implicit_tree import generate_implicit_tree
+from search_engine import alphabeta_iterative
+from tree_io import load_tree
+
+# Multi-process alpha-beta, Young Brothers Wait at the root.
+# The first root child (the eldest brother) is searched serially and gives an
+# exact bound. The subtrees of its younger brothers are cut at `split_ply` and
+# handed to a process pool. The best root score found so far lives in a
+# shared double; every worker re-reads it while searching and narrows its
+# window, and the parent raises it as soon as a whole root child is finished.
+#
+# Scores below are from the root player's point of view ("root scores"):
+# root MAX -> leaf value, root MIN -> -leaf value, so the root always maximizes.
+
+_tree = None
+_bound = None
+
+
+def _init_worker(tree, bound):
+    global _tree, _bound
+    _tree, _bound = tree, bound
+
+
+def _negamax(level, index, alpha, beta, color, counter):
+    tree = _tree
+    counter[0] += 1
+    if level == tree.depth - 1:
+        return color * tree.leaf_value(index)
+    # nodes on even levels see the root bound as alpha, odd levels as -beta
+    if tree.depth - level > 2:
+        shared = _bound.value
+        if level % 2 == 0:
+            if shared > alpha:
+                alpha = shared
+        elif -shared < beta:
+            beta = -shared
+        if alpha >= beta:
+            return alpha if level % 2 == 0 else beta
+    best = float("-inf")
+    for child in tree.children(index):
+        score = -_negamax(level + 1, child, -beta, -alpha, -color, counter)
+        if score > best:
+            best = score
+        if score > alpha:
+            alpha = score
+        if alpha >= beta:
+            break
+    return best
+
+
+# Search one subtree; returns its root score (fail-soft) and the node count
+def _search_task(task):
+    level, index, root_color = task
+    counter = [0]
+    color = root_color if level % 2 == 0 else -root_color
+    value = _negamax(level, index, float("-inf"), float("inf"), color, counter)
+    score = value if level % 2 == 0 else -value
+    return level, index, score, counter[0]
+
+
+# Minimax over the levels between a root child and its split-ply descendants
+def _combine(scores, branching, first_level, split_ply):
+    values = list(scores)
+    for level in range(split_ply - 1, first_level - 1, -1):
+        groups = [values[i:i + branching] for i in range(0, len(values), branching)]
+        values = [max(g) if level % 2 == 0 else min(g) for g in groups]
+    return values[0]
+
+
+def _pick_split_ply(tree, workers):
+    ply = 1
+    while ply < tree.depth - 2 and (tree.branching - 1) * tree.branching ** (ply - 1) < 4 * workers:
+        ply += 1
+    return ply
+
+
+@dataclass
+class ParallelResult:
+    value: float
+    nodes: int
+    elapsed: float
+    workers: int
+    split_ply: int
+
+
+def parallel_alphabeta(tree, player_name, workers=4, split_ply=None) -> ParallelResult:
+    start = time.perf_counter()
+    root_color = 1 if player_name == "MAX" else -1
+    if tree.depth <= 2:
+        stats = alphabeta_iterative(tree, player_name)
+        return ParallelResult(stats.value, stats.nodes, time.perf_counter() - start, 1, 0)
+    if split_ply is None:
+        split_ply = _pick_split_ply(tree, workers)
+    b = tree.branching
+
+    bound = RawValue("d", float("-inf"))
+    _init_worker(tree, bound)
+    eldest = tree.children(0)[0]
+    _, _, best, nodes = _search_task((1, eldest, root_color))
+    nodes += 1                                       # the root
+    bound.value = best
+
+    # younger brothers, each cut into subtrees at split_ply
+    tasks = []
+    for child in tree.children(0)[1:]:
+        first = child * b ** (split_ply - 1)
+        tasks += [(split_ply, i, root_color) for i in range(first, first + b ** (split_ply - 1))]
+    per_child = b ** (split_ply - 1)
+    scores = {}
+    pending = {}
+
+    with Pool(workers, initializer=_init_worker, initargs=(tree, bound)) as pool:
+        for level, index, score, count in pool.imap_unordered(_search_task, tasks):
+            nodes += count
+            scores[index] = score
+            child = index // per_child
+            pending[child] = pending.get(child, 0) + 1
+            if pending[child] == per_child:
+                first = child * per_child
+                value = _combine([scores[i] for i in range(first, first + per_child)], b, 1, split_ply)
+                if value > best:
+                    best = value
+                    bound.value = best
+    # interior nodes between the root children and the split ply
+    nodes += (b - 1) * sum(b ** (p - 1) for p in range(1, split_ply))
+    return ParallelResult(root_color * best, nodes, time.perf_counter() - start, workers, split_ply)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parallel root-split alpha-beta")
+    parser.add_argument("--depth", type=int, default=12)
+    parser.add_argument("--branching", type=int, default=3)
+    parser.add_argument("--player", choices=["MAX", "MIN"], default="MIN")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--load", metavar="PATH", help="memory-map a tree file (shared by all workers)")
+    args = parser.parse_args()
+
+    if args.load:
+        tree = load_tree(args.load)
+    else:
+        tree = generate_implicit_tree(args.depth, args.branching, args.seed)
+    serial = alphabeta_iterative(tree, args.player)
+    print(f"serial alpha-beta: value {serial.value}, nodes {serial.nodes}, time {serial.elapsed:.3f} sec")
+    print(f"{'workers':>7} {'split ply':>9} {'value':>6} {'nodes':>9} {'overhead':>9} {'time, s':>8} {'speedup':>8}")
+    for workers in args.workers:
+        result = parallel_alphabeta(tree, args.player, workers)
+        assert result.value == serial.value, (result.value, serial.value)
+        overhead = (result.nodes - serial.nodes) / serial.nodes * 100
+        print(f"{workers:>7} {result.split_ply:>9} {result.value:>6} {result.nodes:>9} "
+              f"{overhead:>8.1f}% {result.elapsed:>8.3f} {serial.elapsed / result.elapsed:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,238 @@
+import time
+from dataclasses import dataclass
+
+# Iterative minimax / alpha-beta over the implicit tree interface
+# (ImplicitTree, LazyTree): branching, depth, leaf_value(index).
+# The path from the root to the current node is kept in per-level arrays,
+# so there is no recursion and no call per node, and every run gets its own
+# statistics instead of a global counter.
+
+
+@dataclass
+class SearchStats:
+    engine: str
+    value: float
+    nodes_per_depth: list
+    cutoffs_per_depth: list
+    elapsed: float
+
+    @property
+    def nodes(self):
+        return sum(self.nodes_per_depth)
+
+    @property
+    def cutoffs(self):
+        return sum(self.cutoffs_per_depth)
+
+    # geometric mean of the growth from one level to the next
+    @property
+    def effective_branching(self):
+        levels = len(self.nodes_per_depth) - 1
+        if levels == 0:
+            return 0.0
+        return (self.nodes_per_depth[-1] / self.nodes_per_depth[0]) ** (1 / levels)
+
+    @property
+    def nodes_per_second(self):
+        return self.nodes / self.elapsed if self.elapsed > 0 else float("inf")
+
+
+def _search(tree, player_name, prune, engine):
+    depth = tree.depth
+    b = tree.branching
+    leaf_level = depth - 1
+    nodes = [0] * depth
+    cutoffs = [0] * depth
+    start = time.perf_counter()
+
+    nodes[0] = 1
+    if depth == 1:
+        value = tree.leaf_value(0)
+        return SearchStats(engine, value, nodes, cutoffs, time.perf_counter() - start)
+
+    is_max = [(level % 2 == 0) == (player_name == "MAX") for level in range(depth)]
+    index = [0] * depth
+    k = [0] * depth
+    best = [float("-inf") if m else float("inf") for m in is_max]
+    alpha = [float("-inf")] * depth
+    beta = [float("inf")] * depth
+    leaf_value = tree.leaf_value
+
+    level = 0
+    while True:
+        if k[level] < b:
+            child = index[level] * b + k[level]
+            k[level] += 1
+            if level + 1 == leaf_level:
+                nodes[leaf_level] += 1
+                value = leaf_value(child)
+            else:
+                # descend
+                level += 1
+                nodes[level] += 1
+                index[level] = child
+                k[level] = 0
+                best[level] = float("-inf") if is_max[level] else float("inf")
+                alpha[level] = alpha[level - 1]
+                beta[level] = beta[level - 1]
+                continue
+        else:
+            # all children done, hand the value to the parent
+            value = best[level]
+            if level == 0:
+                break
+            level -= 1
+
+        if is_max[level]:
+            if value > best[level]:
+                best[level] = value
+            if value > alpha[level]:
+                alpha[level] = value
+        else:
+            if value < best[level]:
+                best[level] = value
+            if value < beta[level]:
+                beta[level] = value
+        if prune and beta[level] <= alpha[level] and k[level] < b:
+            cutoffs[level] += 1
+            k[level] = b
+
+    return SearchStats(engine, value, nodes, cutoffs, time.perf_counter() - start)
+
+
+def minimax_iterative(tree, player_name) -> SearchStats:
+    return _search(tree, player_name, False, "minimax")
+
+
+def alphabeta_iterative(tree, player_name) -> SearchStats:
+    return _search(tree, player_name, True, "alphabeta")
+
+
+# NegaScout / Principal Variation Search.
+# The first child is searched with the full window, the others with a null
+# window around alpha and re-searched only if they turn out to be better.
+# Recursion depth is the tree depth, which is small.
+def pvs(tree, player_name) -> SearchStats:
+    depth = tree.depth
+    b = tree.branching
+    leaf_level = depth - 1
+    nodes = [0] * depth
+    cutoffs = [0] * depth
+    leaf_value = tree.leaf_value
+
+    def search(level, index, alpha, beta, color):
+        nodes[level] += 1
+        if level == leaf_level:
+            return color * leaf_value(index)
+        first = index * b
+        for child in range(first, first + b):
+            if child == first:
+                score = -search(level + 1, child, -beta, -alpha, -color)
+            else:
+                score = -search(level + 1, child, -alpha - 1, -alpha, -color)
+                if alpha < score < beta:
+                    score = -search(level + 1, child, -beta, -score, -color)
+            if score > alpha:
+                alpha = score
+            if alpha >= beta:
+                if child != first + b - 1:
+                    cutoffs[level] += 1
+                break
+        return alpha
+
+    start = time.perf_counter()
+    color = 1 if player_name == "MAX" else -1
+    value = color * search(0, 0, float("-inf"), float("inf"), color)
+    return SearchStats("pvs", value, nodes, cutoffs, time.perf_counter() - start)
+
+
+# MTD(f): repeated null-window alpha-beta calls that converge on the value.
+# Bounds found by earlier passes are kept in a table keyed by (level, index),
+# so later passes do not redo the same work. Leaves are not stored.
+def mtdf(tree, player_name, first_guess=None, table_limit=1 << 20) -> SearchStats:
+    depth = tree.depth
+    b = tree.branching
+    leaf_level = depth - 1
+    nodes = [0] * depth
+    cutoffs = [0] * depth
+    leaf_value = tree.leaf_value
+    is_max = [(level % 2 == 0) == (player_name == "MAX") for level in range(depth)]
+    table = {}
+
+    def search(level, index, alpha, beta):
+        nodes[level] += 1
+        if level == leaf_level:
+            return leaf_value(index)
+        key = (level, index)
+        bounds = table.get(key)
+        if bounds is not None:
+            lower, upper = bounds
+            if lower >= beta:
+                return lower
+            if upper <= alpha:
+                return upper
+            alpha = max(alpha, lower)
+            beta = min(beta, upper)
+
+        first = index * b
+        if is_max[level]:
+            g = float("-inf")
+            a = alpha
+            for child in range(first, first + b):
+                if g >= beta:
+                    cutoffs[level] += 1
+                    break
+                g = max(g, search(level + 1, child, a, beta))
+                a = max(a, g)
+        else:
+            g = float("inf")
+            bt = beta
+            for child in range(first, first + b):
+                if g <= alpha:
+                    cutoffs[level] += 1
+                    break
+                g = min(g, search(level + 1, child, alpha, bt))
+                bt = min(bt, g)
+
+        lower, upper = bounds if bounds is not None else (float("-inf"), float("inf"))
+        if g <= alpha:
+            upper = g
+        elif g >= beta:
+            lower = g
+        else:
+            lower = upper = g
+        if bounds is not None or len(table) < table_limit:
+            table[key] = (lower, upper)
+        return g
+
+    start = time.perf_counter()
+    g = leaf_value(0) if first_guess is None else first_guess
+    lower, upper = float("-inf"), float("inf")
+    while lower < upper:
+        beta = g + 1 if g == lower else g
+        g = search(0, 0, beta - 1, beta)
+        if g < beta:
+            upper = g
+        else:
+            lower = g
+    return SearchStats("mtdf", g, nodes, cutoffs, time.perf_counter() - start)
+
+
+ENGINES = {
+    "minimax": minimax_iterative,
+    "alphabeta": alphabeta_iterative,
+    "pvs": pvs,
+    "mtdf": mtdf,
+}
+
+
+def format_stats(stats: SearchStats) -> str:
+    lines = [
+        f"{stats.engine}: value {stats.value}, time {stats.elapsed:.6f} sec, "
+        f"nodes {stats.nodes}, cutoffs {stats.cutoffs}, "
+        f"EBF {stats.effective_branching:.3f}, {stats.nodes_per_second:,.0f} nodes/sec",
+        "  depth     nodes  cutoffs",
+    ]
+    for depth, (n, c) in enumerate(zip(stats.nodes_per_depth, stats.cutoffs_per_depth)):
+        lines.append(f"  {depth:>5}  {n:>8}  {c:>7}")
+    return "\n".join(lines)
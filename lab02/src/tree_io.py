@@ -0,0 +1,74 @@
+import os
+import struct
+
+import numpy as np
+
+from implicit_tree import ImplicitTree
+
+# Binary game tree file:
+#   32-byte header: magic, version, branching, depth, seed, leaf dtype code
+#   branching**(depth-1) leaf values, flat, little-endian
+# Loading maps the leaves with np.memmap, so opening is instant whatever the
+# size, and processes reading the same file share the page cache.
+
+MAGIC = b"GTREE\0"
+VERSION = 1
+HEADER = struct.Struct("<6sHIIqc7x")
+
+# dtype code in the header -> little-endian NumPy dtype
+DTYPES = {b"B": "<u1", b"h": "<i2", b"i": "<i4", b"q": "<i8"}
+
+
+def _smallest_dtype(low, high):
+    for code in (b"B", b"h", b"i", b"q"):
+        info = np.iinfo(DTYPES[code])
+        if info.min <= low and high <= info.max:
+            return code
+    raise ValueError(f"leaf values {low}..{high} do not fit in 64 bits")
+
+
+def save_tree(path, tree, seed=None):
+    seed = tree.seed if seed is None else seed
+    leaves = np.asarray(tree.leaves)
+    code = _smallest_dtype(int(leaves.min()), int(leaves.max()))
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, tree.branching, tree.depth, seed or 0, code))
+        leaves.astype(DTYPES[code]).tofile(f)
+
+
+# Write the same tree as generate_implicit_tree(depth, branching, seed)
+# without holding all leaves in memory
+def generate_tree_file(path, max_depth, max_children_per_node, seed=1, chunk=1 << 24):
+    rng = np.random.RandomState(seed)
+    remaining = max_children_per_node ** (max_depth - 1)
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, max_children_per_node, max_depth, seed, b"B"))
+        while remaining:
+            n = min(chunk, remaining)
+            rng.randint(1, 100, size=n).astype("<u1").tofile(f)
+            remaining -= n
+
+
+def read_header(path):
+    with open(path, "rb") as f:
+        raw = f.read(HEADER.size)
+    if len(raw) != HEADER.size:
+        raise ValueError(f"{path}: file too short for a tree header")
+    magic, version, branching, depth, seed, code = HEADER.unpack(raw)
+    if magic != MAGIC:
+        raise ValueError(f"{path}: not a game tree file")
+    if version != VERSION:
+        raise ValueError(f"{path}: unsupported tree file version {version}")
+    if code not in DTYPES:
+        raise ValueError(f"{path}: unknown leaf type {code!r}")
+    return branching, depth, seed, np.dtype(DTYPES[code])
+
+
+def load_tree(path) -> ImplicitTree:
+    branching, depth, seed, dtype = read_header(path)
+    count = branching ** (depth - 1)
+    expected = HEADER.size + count * dtype.itemsize
+    if os.path.getsize(path) != expected:
+        raise ValueError(f"{path}: expected {expected} bytes, found {os.path.getsize(path)}")
+    leaves = np.memmap(path, dtype=dtype, mode="r", offset=HEADER.size, shape=(count,))
+    return ImplicitTree(leaves, branching, depth, seed)
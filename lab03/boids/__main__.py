@@ -1,20 +1,76 @@
+import argparse
 import pygame as pg
-from game import Game
+from game import ENGINES, Game
+from render import RENDERERS
 from boid import Boid
 from pygame import Vector2
 from random import randrange
+import headless
+from config import Config
+from profiler import Profiler
+from trajectory import Recorder, load_trajectory
 
 def main():
+  parser = argparse.ArgumentParser(description="Boids")
+  parser.add_argument("--engine", choices=ENGINES, default="objects")
+  parser.add_argument("--renderer", choices=RENDERERS, default="sprites")
+  parser.add_argument("--boids", type=int, nargs="+", default=[29],
+                      help="flock size; several sizes are only used with --headless")
+  parser.add_argument("--fixed-step", action="store_true",
+                      help="simulate at Config.SIMULATION_HZ on a separate thread, render interpolated")
+  parser.add_argument("--headless", action="store_true", help="no window: run --ticks ticks and print steps/sec")
+  parser.add_argument("--ticks", type=int, default=100)
+  parser.add_argument("--dt", type=float, default=1/60)
+  parser.add_argument("--seed", type=int, default=1)
+  parser.add_argument("--max-neighbors", type=int, default=Config.max_neighbors,
+                      help="k nearest neighbors only (0: everyone inside view_radius)")
+  parser.add_argument("--area", type=int, nargs=2, default=[800, 600], metavar=("W", "H"),
+                      help="spawn area of the flock; small = dense")
+  parser.add_argument("--hud", action="store_true", help="start with the profiling overlay shown (toggle: F3)")
+  parser.add_argument("--telemetry", metavar="PATH", help="write per-frame timings and counters to a CSV file")
+  parser.add_argument("--record", metavar="PATH", help="write every tick to a trajectory file")
+  parser.add_argument("--record-ticks", type=int, default=3600, help="ticks preallocated in the trajectory file")
+  parser.add_argument("--replay", metavar="PATH", help="play a trajectory file instead of simulating")
+  parser.add_argument("--speed", type=float, default=1.0, help="replay speed")
+  args = parser.parse_args()
+  Config.max_neighbors = args.max_neighbors
+
+  if args.replay:
+    trajectory = load_trajectory(args.replay)
+    game = Game(renderer=args.renderer)
+    game.init()
+    game.enter_replay_loop(trajectory, args.speed)
+    return
+
+  if args.headless:
+    if args.record:
+      boids = headless.make_flock(args.boids[0], args.seed, *args.area)
+      with Recorder(args.record, len(boids), args.ticks, args.dt) as recorder:
+        result = headless.run_headless(0, args.ticks, args.dt, args.seed, args.engine, boids, recorder)
+      headless.print_results([result])
+      return
+    headless.main(args.boids, args.ticks, args.seed, [args.engine], args.dt, args.area)
+    return
 
   boids = list()
 
-  for i in range(1,30):
-    boids.append(Boid(Vector2(randrange(1,800), randrange(1,600))))
+  for i in range(args.boids[0]):
+    boids.append(Boid(Vector2(randrange(1,args.area[0]), randrange(1,args.area[1]))))
 
-  game = Game()
+  game = Game(args.engine, args.renderer)
+  game.profiler = Profiler(csv_path=args.telemetry)
+  if args.hud:
+    game.profiler.toggle_hud()
+  if args.record:
+    # the lockstep loop has a variable dt; the file stores the nominal one
+    dt = 1 / (Config.SIMULATION_HZ if args.fixed_step else Config.MAX_FPS)
+    game.recorder = Recorder(args.record, len(boids), args.record_ticks, dt)
   game.init()
-  game.enter_game_loop(boids)
+  if args.fixed_step:
+    game.enter_fixed_step_loop(boids)
+  else:
+    game.enter_game_loop(boids)
 
 
 if __name__ == "__main__":
-  main()
\ No newline at end of file
+  main()
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
+from heapq import nsmallest
 from math import atan2, cos, pi, sin
+from operator import itemgetter
 from random import uniform
 
 from pygame import Vector2
@@ -32,15 +34,22 @@ class Boid:
       self.acceleration = Vector2()
       self.neighbors: list[tuple["Boid", float]] = []
 
-    def sense_neighbors(self, all_boids: list["Boid"]):
-      self.neighbors = []
-      view_radius_sq = Config.view_radius ** 2
-      for boid in all_boids:
-        if boid is self:
-          continue
-        distance_sq = (boid.pos - self.pos).length_squared()
-        if distance_sq <= view_radius_sq:
-          self.neighbors.append((boid, distance_sq))
+    def sense_neighbors(self, all_boids: list["Boid"], grid=None):
+      if grid is not None:
+        self.neighbors = grid.query(self)
+      else:
+        self.neighbors = []
+        view_radius_sq = Config.view_radius ** 2
+        for boid in all_boids:
+          if boid is self:
+            continue
+          distance_sq = (boid.pos - self.pos).length_squared()
+          if distance_sq <= view_radius_sq:
+            self.neighbors.append((boid, distance_sq))
+      # topological mode: only the k nearest of them (partial selection, no full sort)
+      k = Config.max_neighbors
+      if k > 0 and len(self.neighbors) > k:
+        self.neighbors = nsmallest(k, self.neighbors, key=itemgetter(1))
 
     def _count_force_separation(self) -> Vector2:
       separation_sum_vector = Vector2()
@@ -6,12 +6,17 @@ class Config:
   SCREEN_HEIGHT:int = 900
 
   MAX_FPS:int = 60
+  SIMULATION_HZ:int = 120
 
   weight_separation:float = 1.3
   weight_alignment:float = 1.4
   weight_coherence:float = 1.2
 
   view_radius: float = 150.0
+  use_spatial_grid: bool = True
+  # 0 - every boid inside view_radius is a neighbor;
+  # k > 0 - only the k nearest of them (bounded force cost in dense clusters)
+  max_neighbors: int = 0
 
   max_force: float = 80.0
   max_speed: float = 360.0
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import threading
+import time
+
+from config import Config
+from flock import Snapshot
+
+
+# Simulation on its own thread with a fixed timestep.
+# The thread calls Game.on_loop with dt = 1 / Config.SIMULATION_HZ, as many
+# times as the wall clock asks for, and after every tick publishes a Snapshot.
+# Only the last two snapshots are kept (previous, current) and they are
+# swapped as one pair under a lock - a double buffer of immutable states.
+# The renderer draws the flock interpolated between them, so the picture
+# moves smoothly at any display rate, and a slow frame never changes dt.
+
+
+class SimulationThread(threading.Thread):
+  def __init__(self, step, boids, hz:float = Config.SIMULATION_HZ, max_catch_up:int = 5):
+    super().__init__(name="boids-simulation", daemon=True)
+    self.step = step
+    self.boids = boids
+    self.dt = 1.0 / hz
+    # after a stall run at most this many ticks back to back, then drop the rest
+    self.max_catch_up = max_catch_up
+    self.ticks = 0
+    self._lock = threading.Lock()
+    self._stopping = threading.Event()
+    self.error: BaseException | None = None  # what ended run(), if step raised
+    now = time.perf_counter()
+    first = Snapshot.capture(boids, 0, now)
+    self._pair = (first, first)
+
+  def snapshots(self) -> tuple[Snapshot, Snapshot]:
+    with self._lock:
+      return self._pair
+
+  def interpolated(self, now:float | None = None) -> Snapshot:
+    previous, current = self.snapshots()
+    if current is previous:
+      return current
+    now = time.perf_counter() if now is None else now
+    # the renderer is one tick behind the simulation: at current.time it
+    # shows `previous`, a tick later it reaches `current`
+    span = max(current.tick - previous.tick, 1) * self.dt
+    alpha = min(max((now - current.time) / span, 0.0), 1.0)
+    return previous.interpolate(current, alpha)
+
+  def run(self):
+    try:
+      self._run()
+    except BaseException as error:
+      # kept for the render loop, which re-raises it on the main thread
+      self.error = error
+
+  def _run(self):
+    clock = time.perf_counter
+    next_tick = clock()
+    while not self._stopping.is_set():
+      now = clock()
+      if now < next_tick:
+        time.sleep(min(next_tick - now, 0.002))
+        continue
+      behind = int((now - next_tick) / self.dt) + 1
+      if behind > self.max_catch_up:
+        # keep the last max_catch_up ticks of the backlog, forget the older ones
+        behind = self.max_catch_up
+        next_tick = now - (behind - 1) * self.dt
+      for _ in range(behind):
+        self.step(self.dt, self.boids)
+        self.ticks += 1
+        next_tick += self.dt
+      snapshot = Snapshot.capture(self.boids, self.ticks, clock())
+      with self._lock:
+        self._pair = (self._pair[1], snapshot)
+
+  def check(self) -> None:
+    """Re-raise the exception the simulation stopped with, if any."""
+    if self.error is not None:
+      raise self.error
+
+  def stop(self):
+    self._stopping.set()
+    if self.is_alive():
+      self.join()
+
+
+class RateMeter:
+  """Events per second over the last `window` seconds."""
+
+  def __init__(self, window:float = 0.5):
+    self.window = window
+    self.start = time.perf_counter()
+    self.count = 0
+    self.rate = 0.0
+
+  def add(self, count:int = 1) -> bool:
+    """Count events; True when a new rate was computed."""
+    self.count += count
+    now = time.perf_counter()
+    if now - self.start < self.window:
+      return False
+    self.rate = self.count / (now - self.start)
+    self.start, self.count = now, 0
+    return True
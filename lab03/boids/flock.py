@@ -0,0 +1,305 @@
+from __future__ import annotations
+
+import numpy as np
+
+from config import Config
+
+
+# Struct-of-arrays version of the flock: positions, velocities and
+# accelerations of all boids live in (N, 2) float arrays and every rule from
+# Boid is applied to the whole flock at once. The rules and the Config
+# weights are the same as in boid.py; only the order of floating point sums
+# differs.
+
+
+def neighbor_pairs(pos: np.ndarray, radius: float, cell_size: float | None = None,
+                   queries: np.ndarray | None = None):
+  """All ordered pairs (i, j), i != j, with |pos[j] - pos[i]|^2 <= radius^2.
+
+  Boids are binned into square cells of side >= radius; candidate pairs are
+  only generated between each occupied cell and its 3x3 block. With
+  `queries` (indices into pos) only the pairs whose i is one of them are built.
+  Returns the index arrays i, j and the squared distances.
+  """
+  n = len(pos)
+  empty = (np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64), np.empty(0))
+  if n < 2 or radius <= 0:
+    return empty
+  cell = max(cell_size or radius, radius)
+  cx = np.floor(pos[:, 0] / cell).astype(np.int64)
+  cy = np.floor(pos[:, 1] / cell).astype(np.int64)
+  cx -= cx.min()
+  cy -= cy.min()
+  ncx, ncy = int(cx.max()) + 1, int(cy.max()) + 1
+
+  cell_id = cx * ncy + cy
+  order = np.argsort(cell_id, kind="stable")
+  counts = np.bincount(cell_id, minlength=ncx * ncy)
+  starts = np.cumsum(counts) - counts
+  if queries is None:
+    query_order, query_counts, query_starts = order, counts, starts
+  else:
+    query_cell = cell_id[queries]
+    query_order = queries[np.argsort(query_cell, kind="stable")]
+    query_counts = np.bincount(query_cell, minlength=ncx * ncy)
+    query_starts = np.cumsum(query_counts) - query_counts
+  occupied = np.flatnonzero(query_counts)
+  ox, oy = occupied // ncy, occupied % ncy
+
+  all_i, all_j = [], []
+  for dx in (-1, 0, 1):
+    for dy in (-1, 0, 1):
+      nx, ny = ox + dx, oy + dy
+      valid = (nx >= 0) & (nx < ncx) & (ny >= 0) & (ny < ncy)
+      a = occupied[valid]
+      b = nx[valid] * ncy + ny[valid]
+      nb = counts[b]
+      total = query_counts[a] * nb
+      keep = total > 0
+      a, b, nb, total = a[keep], b[keep], nb[keep], total[keep]
+      if len(a) == 0:
+        continue
+      # every (member of a) x (member of b) for every cell pair, without a Python loop
+      pair = np.repeat(np.arange(len(a)), total)
+      k = np.arange(total.sum()) - np.repeat(np.cumsum(total) - total, total)
+      all_i.append(query_order[query_starts[a][pair] + k // nb[pair]])
+      all_j.append(order[starts[b][pair] + k % nb[pair]])
+  if not all_i:
+    return empty
+
+  i = np.concatenate(all_i)
+  j = np.concatenate(all_j)
+  d = pos[j] - pos[i]
+  d2 = np.einsum("ij,ij->i", d, d)
+  mask = (i != j) & (d2 <= radius * radius)
+  return i[mask], j[mask], d2[mask]
+
+
+def nearest_pairs(i: np.ndarray, j: np.ndarray, d2: np.ndarray, n: int, k: int, block: int = 1 << 22):
+  """Keep, for every boid i, only its k pairs with the smallest d2.
+
+  Only boids with more than k neighbors are touched: their distances are
+  laid out as rows of a padded matrix (a few rows at a time, at most `block`
+  cells) and np.partition finds the k-th smallest per row, without sorting.
+  Ties at the k-th distance go to the lower j, like heapq.nsmallest over
+  the flock-ordered list in Boid.sense_neighbors.
+  """
+  counts = np.bincount(i, minlength=n)
+  if k <= 0 or len(i) == 0 or counts.max() <= k:
+    return i, j, d2
+  order = np.lexsort((j, i))
+  i, j, d2 = i[order], j[order], d2[order]
+  starts = np.cumsum(counts) - counts
+
+  keep = np.ones(len(i), dtype=bool)
+  crowded = np.flatnonzero(counts > k)
+  width = int(counts[crowded].max())
+  rows_per_block = max(1, block // width)
+  column = np.arange(width)
+  for first in range(0, len(crowded), rows_per_block):
+    rows = crowded[first:first + rows_per_block]
+    index = starts[rows][:, None] + column
+    valid = column < counts[rows][:, None]
+    index = np.where(valid, index, 0)
+    distances = np.where(valid, d2[index], np.inf)
+    kth = np.partition(distances, k - 1, axis=1)[:, k - 1:k]
+    closer = distances < kth
+    tied = distances == kth
+    room = k - closer.sum(axis=1, keepdims=True)
+    take = closer | (tied & (np.cumsum(tied, axis=1) <= room))
+    keep[index[valid]] = take[valid]
+  return i[keep], j[keep], d2[keep]
+
+
+def _sum_by(index: np.ndarray, values: np.ndarray, n: int) -> np.ndarray:
+  if values.ndim == 1:
+    return np.bincount(index, weights=values, minlength=n)
+  return np.stack([np.bincount(index, weights=values[:, c], minlength=n) for c in range(values.shape[1])], axis=1)
+
+
+def limit(v: np.ndarray, m: float) -> np.ndarray:
+  """Boid._limit for every row: rows longer than m are scaled to length m."""
+  if m <= 0:
+    return v
+  length_sq = np.einsum("ij,ij->i", v, v)
+  over = length_sq > m * m
+  if over.any():
+    v[over] *= (m / np.sqrt(length_sq[over]))[:, None]
+  return v
+
+
+def _steer_towards(direction: np.ndarray, vel: np.ndarray, valid: np.ndarray) -> np.ndarray:
+  """normalize(direction) * max_speed - velocity, limited to max_force; zero where not valid."""
+  force = np.zeros_like(vel)
+  length_sq = np.einsum("ij,ij->i", direction, direction)
+  valid = valid & (length_sq > 0)
+  if valid.any():
+    unit = direction[valid] / np.sqrt(length_sq[valid])[:, None]
+    force[valid] = unit * Config.max_speed - vel[valid]
+    limit(force, Config.max_force)
+  return force
+
+
+def steering(pos: np.ndarray, vel: np.ndarray, i: np.ndarray, j: np.ndarray, d2: np.ndarray,
+             targets: np.ndarray | None = None) -> np.ndarray:
+  """Boid.count_result_vector for the whole flock.
+
+  (i, j, d2) are the neighbor pairs of boid i. With `targets` only those
+  boids get a force (the rest of the result is zero).
+  """
+  n = len(pos)
+  radius = Config.view_radius
+
+  # separation
+  effective = np.maximum(d2, Config.minimum_effective_distance_sq)
+  separation_sum = _sum_by(i, (pos[i] - pos[j]) / effective[:, None], n)
+
+  # alignment and cohesion share the proximity weight
+  if radius > 0:
+    weight = 1.0 - np.minimum(np.sqrt(d2) / radius, 1.0)
+  else:
+    weight = np.zeros_like(d2)
+  weight_sum = _sum_by(i, weight, n)
+  velocity_sum = _sum_by(i, vel[j] * weight[:, None], n)
+  position_sum = _sum_by(i, pos[j] * weight[:, None], n)
+
+  has_neighbors = np.bincount(i, minlength=n) > 0
+  if targets is not None:
+    mask = np.zeros(n, dtype=bool)
+    mask[targets] = True
+    has_neighbors &= mask
+  weighted = has_neighbors & (weight_sum > 0.0)
+  safe_sum = np.where(weight_sum > 0.0, weight_sum, 1.0)[:, None]
+
+  separation = _steer_towards(separation_sum, vel, has_neighbors)
+  alignment = _steer_towards(velocity_sum / safe_sum, vel, weighted)
+  cohesion = _steer_towards(position_sum / safe_sum - pos, vel, weighted)
+
+  steer = (
+    Config.weight_separation * separation
+    + Config.weight_alignment * alignment
+    + Config.weight_coherence * cohesion
+  )
+  steer[~has_neighbors] = 0.0
+  return limit(steer, Config.max_force)
+
+
+def integrate(pos: np.ndarray, vel: np.ndarray, acc: np.ndarray, dt: float, rng: np.random.Generator,
+              rows: np.ndarray | slice = slice(None)) -> None:
+  """Boid.update for the given rows, in place."""
+  if dt <= 0.0:
+    return
+  p, v = pos[rows], vel[rows]
+  v += acc[rows] * dt
+  limit(v, Config.max_speed)
+  v *= Config.friction
+
+  speed = np.sqrt(np.einsum("ij,ij->i", v, v))
+  slow = speed < Config.min_speed
+  stalled = slow & (speed <= Config.minimum_effective_distance_sq)
+  rescale = slow & ~stalled
+  v[rescale] *= (Config.min_speed / speed[rescale])[:, None]
+  if stalled.any():
+    fresh = rng.uniform(-1, 1, size=(int(stalled.sum()), 2))
+    length = np.sqrt(np.einsum("ij,ij->i", fresh, fresh))
+    fresh[length == 0.0] = (1.0, 0.0)
+    length[length == 0.0] = 1.0
+    v[stalled] = fresh / length[:, None] * Config.min_speed
+
+  p += v * dt
+
+  # wall reflection
+  for axis, size in ((0, Config.SCREEN_WIDTH), (1, Config.SCREEN_HEIGHT)):
+    low = p[:, axis] < 0.0
+    high = p[:, axis] > size
+    p[low, axis] = 0.0
+    p[high, axis] = size
+    flip = (low & (v[:, axis] < 0.0)) | (high & (v[:, axis] > 0.0))
+    v[flip, axis] *= -1
+
+  pos[rows], vel[rows] = p, v
+  acc[rows] = 0.0
+
+
+def triangle_vertices(pos: np.ndarray, vel: np.ndarray, size: int = 10) -> np.ndarray:
+  """Boid.get_vertices for every boid, shape (N, 3, 2)."""
+  vx, vy = vel[:, 0].copy(), vel[:, 1].copy()
+  still = (vx == 0.0) & (vy == 0.0)
+  vx[still] = 1.0
+  ang = np.arctan2(vy, vx)[:, None] + np.array([0.0, 0.75 * np.pi, -0.75 * np.pi])
+  return np.stack([pos[:, 0:1] + size * np.cos(ang), pos[:, 1:2] + size * np.sin(ang)], axis=2)
+
+
+class Snapshot:
+  """Read-only copy of the flock state after simulation tick `tick`.
+
+  A snapshot is never written after it is published, so the render thread
+  can keep reading it while the simulation thread builds the next one.
+  """
+
+  def __init__(self, tick: int, time: float, pos: np.ndarray, vel: np.ndarray):
+    self.tick = tick
+    self.time = time
+    self.pos = pos
+    self.vel = vel
+
+  @classmethod
+  def capture(cls, boids, tick: int, time: float) -> "Snapshot":
+    if isinstance(boids, Flock):
+      return cls(tick, time, boids.pos.copy(), boids.vel.copy())
+    pos = np.array([(b.pos.x, b.pos.y) for b in boids], dtype=np.float64).reshape(-1, 2)
+    vel = np.array([(b.velocity.x, b.velocity.y) for b in boids], dtype=np.float64).reshape(-1, 2)
+    return cls(tick, time, pos, vel)
+
+  def interpolate(self, newer: "Snapshot", alpha: float) -> "Snapshot":
+    """State `alpha` of the way from this snapshot to `newer` (0 -> self, 1 -> newer)."""
+    pos = self.pos + (newer.pos - self.pos) * alpha
+    return Snapshot(newer.tick, self.time + (newer.time - self.time) * alpha, pos, newer.vel)
+
+  def __len__(self) -> int:
+    return len(self.pos)
+
+  def get_vertices(self, size: int = 10) -> np.ndarray:
+    return triangle_vertices(self.pos, self.vel, size)
+
+
+class Flock:
+  """The whole flock as arrays; same three phases as Game.on_loop."""
+
+  def __init__(self, pos: np.ndarray, vel: np.ndarray, seed: int | None = None):
+    self.pos = np.asarray(pos, dtype=np.float64).copy()
+    self.vel = np.asarray(vel, dtype=np.float64).copy()
+    self.acc = np.zeros_like(self.pos)
+    self.rng = np.random.default_rng(seed)
+    self.pairs = neighbor_pairs(self.pos[:0], 0.0)
+
+  @classmethod
+  def from_boids(cls, boids: list, seed: int | None = None) -> "Flock":
+    pos = np.array([(b.pos.x, b.pos.y) for b in boids], dtype=np.float64).reshape(-1, 2)
+    vel = np.array([(b.velocity.x, b.velocity.y) for b in boids], dtype=np.float64).reshape(-1, 2)
+    return cls(pos, vel, seed)
+
+  def __len__(self) -> int:
+    return len(self.pos)
+
+  def sense_neighbors(self) -> None:
+    i, j, d2 = neighbor_pairs(self.pos, Config.view_radius)
+    self.pairs = nearest_pairs(i, j, d2, len(self.pos), Config.max_neighbors)
+
+  def count_result_vector(self) -> None:
+    i, j, d2 = self.pairs
+    self.acc = steering(self.pos, self.vel, i, j, d2)
+
+  def update(self, dt: float) -> None:
+    integrate(self.pos, self.vel, self.acc, dt, self.rng)
+
+  def step(self, dt: float) -> None:
+    self.sense_neighbors()
+    self.count_result_vector()
+    self.update(dt)
+
+  def neighbor_counts(self) -> np.ndarray:
+    return np.bincount(self.pairs[0], minlength=len(self.pos))
+
+  def get_vertices(self, size: int = 10) -> np.ndarray:
+    return triangle_vertices(self.pos, self.vel, size)
@@ -1,16 +1,32 @@
+import time
 import pygame as pg
 from boid import Boid
 from config import Config, Colors
+from fixed_step import RateMeter, SimulationThread
+from flock import Flock
+from profiler import Profiler
+from render import RENDERERS, make_renderer
+from spatial import SpatialGrid
 
+# "objects" - one Boid object per boid (boid.py)
+# "numpy"   - struct-of-arrays Flock (flock.py)
+ENGINES = ("objects", "numpy")
 
 
 class Game:
-  def __init__(self):
+  def __init__(self, engine:str = "objects", renderer:str = "sprites"):
+    if engine not in ENGINES:
+      raise ValueError(f"unknown engine {engine!r}, expected one of {ENGINES}")
+    if renderer not in RENDERERS:
+      raise ValueError(f"unknown renderer {renderer!r}, expected one of {RENDERERS}")
     self._running = False
     self.size = self.width, self.height = Config.SCREEN_WIDTH, Config.SCREEN_HEIGHT
-
-  def draw_boid(self,boid_triangle:tuple):
-    pg.draw.polygon(self._display_surf,Colors.BLACK,boid_triangle)
+    self.engine = engine
+    self.grid = SpatialGrid()
+    self.renderer = make_renderer(renderer)
+    self.recorder = None  # trajectory.Recorder, fed after every tick
+    self.profiler = Profiler()  # F3 - timings overlay; Profiler(csv_path=...) logs every frame
+    self._clear_screen = False
 
   def init(self):
     pg.init()
@@ -23,27 +39,95 @@ class Game:
   def on_event(self, event):
     if event.type == pg.QUIT:
       self._running = False
+    elif event.type == pg.KEYDOWN and event.key == pg.K_F3:
+      self.profiler.toggle_hud()
+      self._clear_screen = not self.profiler.hud
+    elif event.type in (pg.VIDEOEXPOSE, pg.WINDOWEXPOSED):
+      # the window was uncovered or restored: repaint all of it
+      self._clear_screen = True
 
-  def on_loop(self, dt:float,boids:list["Boid"]):
+  def prepare(self, boids:list):
+    if self.engine == "numpy" and not isinstance(boids, Flock):
+      return Flock.from_boids(boids)
+    return boids
+
+  # The three phases of a tick, also timed one by one by headless.py
+  def sense(self, boids:list["Boid"]):
+    if isinstance(boids, Flock):
+      boids.sense_neighbors()
+      return
+    grid = None
+    if Config.use_spatial_grid:
+      grid = self.grid
+      grid.update(boids)
     for b in boids:
-      b.sense_neighbors(boids)
+      b.sense_neighbors(boids, grid)
 
+  def force(self, boids:list["Boid"]):
+    if isinstance(boids, Flock):
+      boids.count_result_vector()
+      return
     for b in boids:
       b.count_result_vector()
 
+  def update(self, dt:float, boids:list["Boid"]):
+    if isinstance(boids, Flock):
+      boids.update(dt)
+      return
     for b in boids:
       b.update(dt)
 
+  def on_loop(self, dt:float,boids:list["Boid"]):
+    profiler = self.profiler
+    if not profiler.enabled:
+      self.sense(boids)
+      self.force(boids)
+      self.update(dt, boids)
+    else:
+      start = time.perf_counter()
+      self.sense(boids)
+      sensed = time.perf_counter()
+      self.force(boids)
+      forced = time.perf_counter()
+      self.update(dt, boids)
+      profiler.add("sense", sensed - start)
+      profiler.add("force", forced - sensed)
+      profiler.add("update", time.perf_counter() - forced)
+      profiler.count(boids, self.grid if Config.use_spatial_grid else None)
+    if self.recorder is not None:
+      self.recorder.record(boids)
+
   def on_render(self, dt:float, boids:list):
-    self._display_surf.fill(Colors.WHITE)
-    for boid in boids:
-      self.draw_boid(boid.get_vertices())
-    pg.display.update()
+    profiler = self.profiler
+    if profiler.enabled:
+      start = time.perf_counter()
+    dirty = self.renderer.draw(self._display_surf, boids)
+    if self._clear_screen:
+      # the HUD was just hidden or the window exposed: the sprite renderer only erases boids
+      self._display_surf.fill(Colors.WHITE)
+      self.renderer.draw(self._display_surf, boids)
+      self._clear_screen = False
+      dirty = None
+    if profiler.hud:
+      box = profiler.draw(self._display_surf)
+      if dirty is not None:
+        dirty.append(box)
+    if dirty is None:
+      pg.display.update()
+    else:
+      pg.display.update(dirty)
+    if profiler.enabled:
+      profiler.add("render", time.perf_counter() - start)
+      profiler.end_frame()
 
   def on_cleanup(self):
+    if self.recorder is not None:
+      self.recorder.close()
+    self.profiler.close()
     pg.quit()
 
   def enter_game_loop(self, boids:list):
+    boids = self.prepare(boids)
     while self._running == True:
       for event in pg.event.get():
         self.on_event(event)
@@ -52,3 +136,63 @@ class Game:
       self.on_loop(dt, boids)
       self.on_render(dt, boids)
     self.on_cleanup()
+
+  # Simulation at Config.SIMULATION_HZ on its own thread, drawing at MAX_FPS
+  def enter_fixed_step_loop(self, boids:list):
+    boids = self.prepare(boids)
+    simulation = SimulationThread(self.on_loop, boids)
+    render_rate, sim_rate = RateMeter(), RateMeter()
+    simulation.start()
+    last_ticks = 0
+    try:
+      while self._running == True:
+        for event in pg.event.get():
+          self.on_event(event)
+        dt = self.frames_per_sec.tick(Config.MAX_FPS) / 1000.0
+        simulation.check()  # a failed tick ends the loop like it does in lockstep
+        self.on_render(dt, simulation.interpolated())
+
+        ticks = simulation.ticks
+        sim_rate.add(ticks - last_ticks)
+        last_ticks = ticks
+        if render_rate.add():
+          pg.display.set_caption(f"Boids Game - sim {sim_rate.rate:.0f} Hz, render {render_rate.rate:.0f} FPS")
+    finally:
+      simulation.stop()
+    self.on_cleanup()
+
+
+  # Play a recorded trajectory file; nothing is simulated.
+  # SPACE pause, LEFT/RIGHT seek 1 s, UP/DOWN speed x2 / /2, HOME restart
+  def enter_replay_loop(self, trajectory, speed:float = 1.0):
+    position, paused = 0.0, False
+    last = len(trajectory) - 1
+    if last < 0:
+      self._running = False
+    while self._running == True:
+      for event in pg.event.get():
+        self.on_event(event)
+        if event.type != pg.KEYDOWN:
+          continue
+        if event.key == pg.K_SPACE:
+          paused = not paused
+        elif event.key == pg.K_RIGHT:
+          position += 1.0 / trajectory.dt
+        elif event.key == pg.K_LEFT:
+          position -= 1.0 / trajectory.dt
+        elif event.key == pg.K_UP:
+          speed *= 2.0
+        elif event.key == pg.K_DOWN:
+          speed /= 2.0
+        elif event.key == pg.K_HOME:
+          position = 0.0
+      dt = self.frames_per_sec.tick(Config.MAX_FPS) / 1000.0
+      if not paused:
+        position += dt * speed / trajectory.dt
+      position = min(max(position, 0.0), last)
+
+      tick = int(position)
+      self.on_render(dt, trajectory.snapshot(tick))
+      state = "paused" if paused else f"x{speed:g}"
+      pg.display.set_caption(f"Boids replay - tick {tick}/{last} ({tick * trajectory.dt:.1f} s) {state}")
+    self.on_cleanup()
\ No newline at end of file
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import random
+import time
+from dataclasses import dataclass, field
+
+from pygame import Vector2
+
+from boid import Boid
+from config import Config
+from flock import Flock
+from game import Game
+
+
+# Runs Game.on_loop without a window and without the Clock.tick frame cap:
+# a seeded flock, a fixed dt and a fixed number of ticks. Each phase of the
+# tick (sense, force, update) is timed separately.
+
+PHASES = ("sense", "force", "update")
+
+
+@dataclass
+class HeadlessResult:
+  engine: str
+  boids: int
+  ticks: int
+  dt: float
+  seed: int
+  phase_times: dict = field(default_factory=dict)
+
+  @property
+  def elapsed(self) -> float:
+    return sum(self.phase_times.values())
+
+  @property
+  def steps_per_second(self) -> float:
+    return self.ticks / self.elapsed if self.elapsed > 0 else float("inf")
+
+  def phase_ms(self, phase:str) -> float:
+    return self.phase_times[phase] / self.ticks * 1000 if self.ticks else 0.0
+
+
+def make_flock(n:int, seed:int = 1, width:int = 800, height:int = 600) -> list[Boid]:
+  """n boids at random positions in [1, width) x [1, height), like __main__.
+
+  Boid.__init__ draws its velocity from the global `random`, so it is
+  seeded too; the same seed always gives the same flock.
+  """
+  random.seed(seed)
+  return [Boid(Vector2(random.randrange(1, width), random.randrange(1, height))) for _ in range(n)]
+
+
+def run_headless(n:int, ticks:int = 100, dt:float = 1 / 60, seed:int = 1, engine:str = "objects",
+                 boids:list | None = None, recorder=None, area:tuple = (800, 600)) -> HeadlessResult:
+  game = Game(engine)
+  if boids is None:
+    boids = make_flock(n, seed, *area)
+  if engine == "numpy" and not isinstance(boids, Flock):
+    boids = Flock.from_boids(boids, seed)
+  boids = game.prepare(boids)
+
+  times = dict.fromkeys(PHASES, 0.0)
+  clock = time.perf_counter
+  for _ in range(ticks):
+    start = clock()
+    game.sense(boids)
+    sensed = clock()
+    game.force(boids)
+    forced = clock()
+    game.update(dt, boids)
+    end = clock()
+    times["sense"] += sensed - start
+    times["force"] += forced - sensed
+    times["update"] += end - forced
+    if recorder is not None:
+      recorder.record(boids)
+
+  return HeadlessResult(engine, len(boids), ticks, dt, seed, times)
+
+
+def format_result(r:HeadlessResult) -> str:
+  phases = " ".join(f"{r.phase_ms(p):>10.3f}" for p in PHASES)
+  return f"{r.engine:<8} {r.boids:>7} {r.ticks:>6} {r.steps_per_second:>10.2f} {phases}"
+
+
+def print_results(results:list[HeadlessResult]):
+  header = " ".join(f"{p + ', ms':>10}" for p in PHASES)
+  print(f"{'engine':<8} {'boids':>7} {'ticks':>6} {'steps/s':>10} {header}")
+  for r in results:
+    print(format_result(r))
+
+
+def main(sizes:list[int], ticks:int, seed:int, engines:list[str], dt:float = 1 / 60, area:tuple = (800, 600)):
+  grid = "on" if Config.use_spatial_grid else "off"
+  neighbors = f"k = {Config.max_neighbors} nearest" if Config.max_neighbors > 0 else "radius"
+  print(f"headless: dt {dt:.4f} s, seed {seed}, spatial grid {grid}, neighbors: {neighbors}, area {area[0]}x{area[1]}")
+  results = [run_headless(n, ticks, dt, seed, engine, area=area) for n in sizes for engine in engines]
+  print_results(results)
+  return results
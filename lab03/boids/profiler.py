@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import csv
+import time
+from collections import deque
+
+import numpy as np
+import pygame as pg
+
+from config import Colors, Config
+from flock import Flock
+
+# Per-phase timings and flock counters for the game loop.
+# Game.on_loop / on_render check `profiler.enabled` once and only then read
+# the clock, so with the HUD hidden and no CSV sink the cost is one
+# attribute test per tick. Timings are kept for the last `window` ticks.
+
+PHASES = ("sense", "force", "update", "render")
+COLUMNS = ("frame", "time", *(f"{p}_ms" for p in PHASES),
+           "boids", "neighbors_avg", "neighbors_max", "cell_avg", "cell_max")
+
+
+def _cell_occupancy(flock:Flock) -> np.ndarray:
+  cells = np.floor(flock.pos / Config.view_radius).astype(np.int64)
+  _, counts = np.unique(cells, axis=0, return_counts=True)
+  return counts
+
+
+class Profiler:
+  def __init__(self, window:int = 120, csv_path:str | None = None):
+    self.times = {phase: deque(maxlen=window) for phase in PHASES}
+    self.hud = False
+    self.frame = 0
+    self.start = time.perf_counter()
+    self.counters = dict(boids=0, neighbors_avg=0.0, neighbors_max=0, cell_avg=0.0, cell_max=0)
+    self._csv_file = None
+    self._csv = None
+    if csv_path:
+      self._csv_file = open(csv_path, "w", newline="")
+      self._csv = csv.writer(self._csv_file)
+      self._csv.writerow(COLUMNS)
+    self._font = None
+    self.enabled = self._csv is not None
+
+  def toggle_hud(self) -> None:
+    self.hud = not self.hud
+    self.enabled = self.hud or self._csv is not None
+
+  def add(self, phase:str, seconds:float) -> None:
+    self.times[phase].append(seconds)
+
+  def mean_ms(self, phase:str) -> float:
+    samples = self.times[phase]
+    return sum(samples) / len(samples) * 1000 if samples else 0.0
+
+  def count(self, boids, grid=None) -> None:
+    """Neighbor and grid-cell counters after the sense phase."""
+    if isinstance(boids, Flock):
+      neighbors = boids.neighbor_counts()
+      cells = _cell_occupancy(boids) if len(boids) else np.zeros(1)
+      self.counters.update(
+        boids=len(boids),
+        neighbors_avg=float(neighbors.mean()) if len(neighbors) else 0.0,
+        neighbors_max=int(neighbors.max()) if len(neighbors) else 0,
+        cell_avg=float(cells.mean()), cell_max=int(cells.max()),
+      )
+      return
+    neighbors = [len(b.neighbors) for b in boids] or [0]
+    cells = grid.occupancy() if grid is not None else []
+    self.counters.update(
+      boids=len(boids),
+      neighbors_avg=sum(neighbors) / len(neighbors), neighbors_max=max(neighbors),
+      cell_avg=sum(cells) / len(cells) if cells else 0.0, cell_max=max(cells, default=0),
+    )
+
+  def end_frame(self) -> None:
+    self.frame += 1
+    if self._csv is not None:
+      c = self.counters
+      self._csv.writerow((
+        self.frame, f"{time.perf_counter() - self.start:.4f}",
+        *(f"{self.times[p][-1] * 1000:.3f}" if self.times[p] else "" for p in PHASES),
+        c["boids"], f"{c['neighbors_avg']:.2f}", c["neighbors_max"], f"{c['cell_avg']:.2f}", c["cell_max"],
+      ))
+
+  def lines(self) -> list[str]:
+    c = self.counters
+    total = sum(self.mean_ms(p) for p in PHASES)
+    return [
+      *(f"{p:<7}{self.mean_ms(p):8.2f} ms" for p in PHASES),
+      f"total  {total:8.2f} ms",
+      f"boids  {c['boids']}",
+      f"neigh  avg {c['neighbors_avg']:.1f} max {c['neighbors_max']}",
+      f"cell   avg {c['cell_avg']:.1f} max {c['cell_max']}",
+    ]
+
+  def draw(self, surface:pg.Surface) -> pg.Rect:
+    """Draw the overlay on an opaque box in the top-left corner; returns its rect."""
+    if self._font is None:
+      self._font = pg.font.Font(None, 20)
+    rendered = [self._font.render(line, True, Colors.BLACK) for line in self.lines()]
+    line_height = self._font.get_linesize()
+    box = pg.Rect(0, 0, 220, 8 + line_height * len(rendered))
+    surface.fill((235, 235, 235), box)
+    for k, text in enumerate(rendered):
+      surface.blit(text, (6, 4 + k * line_height))
+    return box
+
+  def close(self) -> None:
+    if self._csv_file is not None:
+      self._csv_file.close()
+      self._csv_file = self._csv = None
+      self.enabled = self.hud
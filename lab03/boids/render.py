@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+from math import atan2, cos, pi, sin
+
+import numpy as np
+import pygame as pg
+
+from config import Colors
+from flock import Flock, Snapshot
+
+# Two ways to draw the flock:
+# "polygons" - the original renderer: Boid.get_vertices (six trig calls) and
+#              one pg.draw.polygon per boid, then a full display.update()
+# "sprites"  - the triangle is pre-rendered once for `headings` quantized
+#              headings; a frame is one atan2 per boid (vectorized for a
+#              Flock), one Surface.blits call, and display.update() of only
+#              the rectangles that were drawn this frame or last frame.
+RENDERERS = ("sprites", "polygons")
+
+
+class PolygonRenderer:
+  def __init__(self, size:int = 10):
+    self.size = size
+
+  def draw(self, surface:pg.Surface, boids) -> list | None:
+    surface.fill(Colors.WHITE)
+    if isinstance(boids, (Flock, Snapshot)):
+      for triangle in boids.get_vertices(self.size).tolist():
+        pg.draw.polygon(surface, Colors.BLACK, triangle)
+    else:
+      for boid in boids:
+        pg.draw.polygon(surface, Colors.BLACK, boid.get_vertices(self.size))
+    return None  # whole screen
+
+
+class SpriteRenderer:
+  def __init__(self, size:int = 10, headings:int = 64, max_dirty:int = 1000):
+    self.size = size
+    self.headings = headings
+    # past this many rectangles one full update is cheaper than the list
+    self.max_dirty = max_dirty
+    self.sprites: list[pg.Surface] = []
+    self.background: pg.Surface | None = None
+    self.previous: list[pg.Rect] = []
+
+  def _build(self, surface:pg.Surface):
+    size = self.size
+    half = size + 1
+    self.sprites = []
+    for k in range(self.headings):
+      angle = 2 * pi * k / self.headings
+      # colorkey + RLE blits much faster than per-pixel alpha
+      sprite = pg.Surface((2 * half + 1, 2 * half + 1))
+      sprite.fill(Colors.WHITE)
+      sprite.set_colorkey(Colors.WHITE, pg.RLEACCEL)
+      triangle = [(half + size * cos(angle + offset), half + size * sin(angle + offset))
+                  for offset in (0.0, 0.75 * pi, -0.75 * pi)]
+      pg.draw.polygon(sprite, Colors.BLACK, triangle)
+      self.sprites.append(sprite.convert() if pg.display.get_surface() else sprite)
+    self.background = pg.Surface(surface.get_size())
+    self.background.fill(Colors.WHITE)
+    self.previous = []
+
+  def _sequence(self, boids):
+    """(sprite, top-left) pairs for Surface.blits."""
+    half = self.size + 1
+    step = self.headings / (2 * pi)
+    sprites = self.sprites
+    if isinstance(boids, (Flock, Snapshot)):
+      vx, vy = boids.vel[:, 0], boids.vel[:, 1]
+      still = (vx == 0.0) & (vy == 0.0)
+      index = np.rint(np.arctan2(vy, np.where(still, 1.0, vx)) * step).astype(np.int64) % self.headings
+      corners = (boids.pos - half).tolist()
+      return [(sprites[k], xy) for k, xy in zip(index.tolist(), corners)]
+    sequence = []
+    for boid in boids:
+      v = boid.velocity
+      k = round(atan2(v.y, v.x if (v.x or v.y) else 1.0) * step) % self.headings
+      sequence.append((sprites[k], (boid.pos.x - half, boid.pos.y - half)))
+    return sequence
+
+  def draw(self, surface:pg.Surface, boids) -> list | None:
+    rebuilt = not self.sprites or self.background.get_size() != surface.get_size()
+    if rebuilt:
+      self._build(surface)
+      surface.blit(self.background, (0, 0))
+    # erase last frame's boids, then draw this frame's; with a big flock
+    # clearing and flipping the whole screen is cheaper than the rect lists
+    full = len(self.previous) > self.max_dirty
+    if full:
+      surface.fill(Colors.WHITE)
+    else:
+      surface.blits([(self.background, r, r) for r in self.previous], doreturn=False)
+    drawn = surface.blits(self._sequence(boids))
+    # the background was just painted everywhere: push the whole screen once
+    dirty = None if rebuilt or full or len(drawn) > self.max_dirty else self.previous + drawn
+    self.previous = drawn
+    return dirty
+
+
+def make_renderer(name:str, size:int = 10):
+  if name == "sprites":
+    return SpriteRenderer(size)
+  if name == "polygons":
+    return PolygonRenderer(size)
+  raise ValueError(f"unknown renderer {name!r}, expected one of {RENDERERS}")
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+from math import floor
+
+from config import Config
+
+
+class SpatialGrid:
+    """Uniform grid of square cells, cell side = view radius.
+
+    Every neighbor of a boid is then inside the 3x3 block of cells around it,
+    so a query looks at those nine buckets instead of the whole flock.
+    Neighbors come back in flock order, exactly like Boid.sense_neighbors
+    without a grid, so the forces are summed in the same order.
+    """
+
+    def __init__(self, cell_size: float | None = None):
+      self.cell_size = cell_size if cell_size is not None else Config.view_radius
+      self.cells: dict[tuple[int, int], list] = {}
+      self._cell_of: dict = {}
+      self._index: dict = {}
+
+    def cell_key(self, pos) -> tuple[int, int]:
+      return (floor(pos.x / self.cell_size), floor(pos.y / self.cell_size))
+
+    def rebuild(self, boids: list) -> None:
+      self.cells = {}
+      self._cell_of = {}
+      self._index = {}
+      for i, boid in enumerate(boids):
+        key = self.cell_key(boid.pos)
+        self.cells.setdefault(key, []).append(boid)
+        self._cell_of[boid] = key
+        self._index[boid] = i
+
+    # Move only the boids that crossed into another cell since the last tick
+    def update(self, boids: list) -> None:
+      if self.cell_size < Config.view_radius:
+        self.cell_size = Config.view_radius
+        self.rebuild(boids)
+        return
+      if len(boids) != len(self._index):
+        self.rebuild(boids)
+        return
+      for boid in boids:
+        key = self.cell_key(boid.pos)
+        old = self._cell_of.get(boid)
+        if old is None:
+          self.rebuild(boids)
+          return
+        if key != old:
+          self.cells[old].remove(boid)
+          if not self.cells[old]:
+            del self.cells[old]
+          self.cells.setdefault(key, []).append(boid)
+          self._cell_of[boid] = key
+
+    def query(self, boid) -> list:
+      cx, cy = self._cell_of[boid]
+      pos = boid.pos
+      radius_sq = Config.view_radius ** 2
+      found = []
+      cells = self.cells
+      for dx in (-1, 0, 1):
+        for dy in (-1, 0, 1):
+          bucket = cells.get((cx + dx, cy + dy))
+          if not bucket:
+            continue
+          for other in bucket:
+            if other is boid:
+              continue
+            distance_sq = (other.pos - pos).length_squared()
+            if distance_sq <= radius_sq:
+              found.append((other, distance_sq))
+      index = self._index
+      found.sort(key=lambda item: index[item[0]])
+      return found
+
+    def occupancy(self) -> list[int]:
+      return [len(bucket) for bucket in self.cells.values()]
@@ -0,0 +1,277 @@
+from __future__ import annotations
+
+import argparse
+import time
+from dataclasses import dataclass
+from multiprocessing import Barrier, Process, RawArray
+from multiprocessing.shared_memory import SharedMemory
+from threading import BrokenBarrierError
+
+import numpy as np
+
+from config import Config
+from flock import Flock, integrate, nearest_pairs, neighbor_pairs, steering
+
+
+# Domain decomposition of the flock over worker processes.
+# The world (SCREEN_WIDTH x SCREEN_HEIGHT) is cut into nx x ny tiles, one per
+# worker. pos, vel and acc of the whole flock live in shared memory. A boid
+# belongs to the tile its position is in; a tile also reads the "ghost" boids
+# within view_radius outside its edges, so its neighbor lists are complete.
+# Every tick has two phases separated by a barrier:
+#   1. forces: each worker senses and steers its own boids (reads everything,
+#      writes only the acc rows of its own boids)
+#   2. move:   each worker integrates its own boids (writes their pos/vel rows)
+# After the second barrier a boid that crossed a tile edge simply belongs to
+# the neighbor tile - that is the handover, no boid is copied.
+# If a worker raises, it aborts all three barriers: the other workers return
+# and the parent gets BrokenBarrierError instead of waiting forever.
+
+_CONFIG_FIELDS = ("SCREEN_WIDTH", "SCREEN_HEIGHT", "view_radius", "max_neighbors")
+
+
+def tile_grid(workers:int) -> tuple[int, int]:
+  """nx x ny == workers with nx >= ny and ny as large as possible (near-square tiles)."""
+  ny = int(workers ** 0.5)
+  while workers % ny:
+    ny -= 1
+  return workers // ny, ny
+
+
+def _tile_edges(workers:int) -> tuple[np.ndarray, np.ndarray]:
+  nx, ny = tile_grid(workers)
+  return np.linspace(0.0, Config.SCREEN_WIDTH, nx + 1), np.linspace(0.0, Config.SCREEN_HEIGHT, ny + 1)
+
+
+def _tile_members(pos:np.ndarray, xs:np.ndarray, ys:np.ndarray, tile:int):
+  """Global indices of the boids owned by `tile` and of its owners + ghosts."""
+  nx = len(xs) - 1
+  tx, ty = tile % nx, tile // nx
+  radius = Config.view_radius
+  # the last tile also owns the boids sitting exactly on the far wall
+  col = np.clip(np.searchsorted(xs, pos[:, 0], side="right") - 1, 0, nx - 1)
+  row = np.clip(np.searchsorted(ys, pos[:, 1], side="right") - 1, 0, len(ys) - 2)
+  owned = np.flatnonzero((col == tx) & (row == ty))
+  near = np.flatnonzero(
+    (pos[:, 0] >= xs[tx] - radius) & (pos[:, 0] <= xs[tx + 1] + radius)
+    & (pos[:, 1] >= ys[ty] - radius) & (pos[:, 1] <= ys[ty + 1] + radius)
+  )
+  return owned, near
+
+
+def _attach(shm:SharedMemory, n:int, k:int) -> np.ndarray:
+  return np.ndarray((k, n, 2), dtype=np.float64, buffer=shm.buf)
+
+
+def _tile_forces(pos, vel, acc, owned, near, block:int = 1 << 21):
+  """acc of the `owned` boids, a run of grid cells at a time.
+
+  neighbor_pairs over all owners + ghosts holds every pair of the tile at
+  once: 100k boids at view_radius 150 are over a billion pairs. Here the
+  owners are sorted by cell and cut into runs of about `block` candidate
+  pairs (an owner has as many as there are boids in its 3x3 cells); a run
+  reads only the boids within view_radius of its bounding box, so the
+  memory per worker does not grow with the flock.
+  """
+  radius = Config.view_radius
+  if radius <= 0:
+    acc[owned] = 0.0
+    return
+  # the same cells as neighbor_pairs, with an empty border
+  cells = np.floor(pos[near] / radius).astype(np.int64)
+  cells -= cells.min(axis=0) - 1
+  grid = np.zeros(tuple(cells.max(axis=0) + 2), dtype=np.int64)
+  np.add.at(grid, (cells[:, 0], cells[:, 1]), 1)
+  w, h = grid.shape
+  around = sum(grid[dx:w - 2 + dx, dy:h - 2 + dy] for dx in range(3) for dy in range(3))
+
+  mine = cells[np.searchsorted(near, owned)]  # both sorted, owned is a subset of near
+  order = np.argsort(mine[:, 0] * h + mine[:, 1], kind="stable")
+  cost = around[mine[order, 0] - 1, mine[order, 1] - 1]
+  run = (np.cumsum(cost) - cost) // block
+  bounds = np.flatnonzero(np.diff(run)) + 1
+  near_pos = pos[near]
+  for members in np.split(owned[order], bounds):
+    members.sort()
+    lo = pos[members].min(axis=0) - radius
+    hi = pos[members].max(axis=0) + radius
+    candidates = near[np.all((near_pos >= lo) & (near_pos <= hi), axis=1)]
+    targets = np.searchsorted(candidates, members)
+    p, v = pos[candidates], vel[candidates]
+    i, j, d2 = neighbor_pairs(p, radius, queries=targets)
+    i, j, d2 = nearest_pairs(i, j, d2, len(candidates), Config.max_neighbors)
+    acc[members] = steering(p, v, i, j, d2, targets)[targets]
+
+
+def _worker(tile, workers, shm, n, config, command, start, done, phase, seed):
+  for name, value in zip(_CONFIG_FIELDS, config):
+    setattr(Config, name, value)
+  pos, vel, acc = _attach(shm, n, 3)
+  xs, ys = _tile_edges(workers)
+  rng = np.random.default_rng(None if seed is None else seed + tile)
+  try:
+    while True:
+      start.wait()
+      ticks, dt = int(command[0]), command[1]
+      if ticks < 0:
+        return
+      for _ in range(ticks):
+        owned, near = _tile_members(pos, xs, ys, tile)
+        if len(owned):
+          _tile_forces(pos, vel, acc, owned, near)
+        phase.wait()
+        if len(owned):
+          integrate(pos, vel, acc, dt, rng, owned)
+        phase.wait()
+      done.wait()
+  except BrokenBarrierError:
+    return  # another worker failed or the parent gave up
+  except BaseException:
+    for barrier in (start, phase, done):
+      barrier.abort()
+    raise
+  finally:
+    del pos, vel, acc
+    shm.close()
+
+
+@dataclass
+class TiledResult:
+  boids: int
+  workers: int
+  ticks: int
+  elapsed: float
+
+  @property
+  def steps_per_second(self) -> float:
+    return self.ticks / self.elapsed if self.elapsed > 0 else float("inf")
+
+
+class TiledFlock:
+  """A Flock stepped by `workers` processes over shared memory; use as a context manager."""
+
+  def __init__(self, pos:np.ndarray, vel:np.ndarray, workers:int = 4, seed:int | None = None):
+    self.n = len(pos)
+    self.workers = workers
+    self.shm = SharedMemory(create=True, size=max(3 * self.n * 2 * 8, 1))
+    self.pos, self.vel, self.acc = _attach(self.shm, self.n, 3)
+    self.pos[:] = pos
+    self.vel[:] = vel
+    self.acc[:] = 0.0
+
+    self.command = RawArray("d", 2)
+    self.start = Barrier(workers + 1)
+    self.done = Barrier(workers + 1)
+    phase = Barrier(workers)
+    config = tuple(getattr(Config, name) for name in _CONFIG_FIELDS)
+    self.processes = [
+      Process(target=_worker, daemon=True,
+              args=(t, workers, self.shm, self.n, config, self.command, self.start, self.done, phase, seed))
+      for t in range(workers)
+    ]
+    for p in self.processes:
+      p.start()
+
+  @classmethod
+  def from_flock(cls, flock:Flock, workers:int = 4, seed:int | None = None) -> "TiledFlock":
+    return cls(flock.pos, flock.vel, workers, seed)
+
+  def __len__(self) -> int:
+    return self.n
+
+  def run(self, ticks:int, dt:float) -> None:
+    self.command[0], self.command[1] = ticks, dt
+    try:
+      self.start.wait()
+      self.done.wait()
+    except BrokenBarrierError:
+      # a worker raised (its traceback is on stderr) and aborted the barriers
+      self.close()
+      raise
+
+  def step(self, dt:float) -> None:
+    self.run(1, dt)
+
+  def close(self) -> None:
+    if self.processes:
+      self.command[0] = -1
+      try:
+        self.start.wait()
+      except BrokenBarrierError:
+        pass  # the workers have returned already
+      for p in self.processes:
+        p.join()
+      self.processes = []
+    if self.shm is not None:
+      del self.pos, self.vel, self.acc
+      self.shm.close()
+      self.shm.unlink()
+      self.shm = None
+
+  def __enter__(self):
+    return self
+
+  def __exit__(self, *exc):
+    self.close()
+
+
+def random_flock(n:int, seed:int = 1) -> Flock:
+  """n boids spread over the whole world, at half the max speed like Boid."""
+  rng = np.random.default_rng(seed)
+  pos = rng.uniform((0, 0), (Config.SCREEN_WIDTH, Config.SCREEN_HEIGHT), size=(n, 2))
+  angle = rng.uniform(0, 2 * np.pi, n)
+  vel = np.stack([np.cos(angle), np.sin(angle)], axis=1) * (0.5 * Config.max_speed)
+  return Flock(pos, vel, seed)
+
+
+def check_against_flock(n:int = 400, ticks:int = 50, workers:int = 4, dt:float = 1 / 60, seed:int = 1) -> float:
+  """Max abs difference of positions between Flock.step and TiledFlock after `ticks`."""
+  flock = random_flock(n, seed)
+  with TiledFlock.from_flock(flock, workers, seed) as tiled:
+    for _ in range(ticks):
+      flock.step(dt)
+    tiled.run(ticks, dt)
+    return float(np.abs(tiled.pos - flock.pos).max())
+
+
+def bench(n:int, workers:int, ticks:int, dt:float = 1 / 60, seed:int = 1) -> TiledResult:
+  flock = random_flock(n, seed)
+  with TiledFlock.from_flock(flock, workers, seed) as tiled:
+    tiled.run(1, dt)  # warm-up: workers started, pages touched
+    start = time.perf_counter()
+    tiled.run(ticks, dt)
+    elapsed = time.perf_counter() - start
+  return TiledResult(n, workers, ticks, elapsed)
+
+
+def main():
+  parser = argparse.ArgumentParser(description="Boids split into tiles over worker processes")
+  parser.add_argument("--boids", type=int, default=100_000)
+  parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+  parser.add_argument("--ticks", type=int, default=10)
+  parser.add_argument("--width", type=int, default=Config.SCREEN_WIDTH)
+  parser.add_argument("--height", type=int, default=Config.SCREEN_HEIGHT)
+  parser.add_argument("--radius", type=float, default=Config.view_radius)
+  parser.add_argument("--seed", type=int, default=1)
+  parser.add_argument("--check", action="store_true", help="compare with the single-process Flock first")
+  args = parser.parse_args()
+
+  Config.SCREEN_WIDTH, Config.SCREEN_HEIGHT, Config.view_radius = args.width, args.height, args.radius
+
+  if args.check:
+    for workers in args.workers:
+      diff = check_against_flock(workers=workers, seed=args.seed)
+      status = "ok" if diff < 1e-6 else "MISMATCH"
+      print(f"check {workers} workers: max |dpos| = {diff:.3e} {status}")
+
+  results = [bench(args.boids, w, args.ticks, seed=args.seed) for w in args.workers]
+  base = results[0]
+  print(f"{'workers':>7} {'tiles':>6} {'boids':>8} {'ticks':>6} {'time, s':>9} {'steps/s':>9} {'speedup':>8}")
+  for r in results:
+    nx, ny = tile_grid(r.workers)
+    print(f"{r.workers:>7} {f'{nx}x{ny}':>6} {r.boids:>8} {r.ticks:>6} {r.elapsed:>9.3f} "
+          f"{r.steps_per_second:>9.2f} {base.elapsed / r.elapsed:>7.2f}x")
+
+
+if __name__ == "__main__":
+  main()
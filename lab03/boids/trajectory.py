@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import os
+import queue
+import struct
+import threading
+
+import numpy as np
+
+from config import Config
+from flock import Snapshot
+
+# Binary trajectory file:
+#   32-byte header: magic, version, boids, capacity (ticks preallocated),
+#   ticks written, dt, world width and height
+#   capacity x boids x (x, y, heading) float32, little-endian
+# The file is created at full size and written through np.memmap, so a
+# replay maps it the same way and reading any frame is a slice, not a parse.
+
+MAGIC = b"BOIDS\0"
+VERSION = 1
+HEADER = struct.Struct("<6sHIIIdHH")
+FRAME_DTYPE = np.dtype("<f4")
+
+
+class Recorder:
+  """Append one frame per tick; the copy is taken in record(), the file
+  write happens on a background thread so on_loop is not blocked by I/O."""
+
+  def __init__(self, path:str, boids:int, capacity:int, dt:float, queue_size:int = 256):
+    if boids <= 0 or capacity <= 0:
+      raise ValueError(f"need at least one boid and one tick, got {boids} boids, {capacity} ticks")
+    self.path = path
+    self.boids = boids
+    self.capacity = capacity
+    self.dt = dt
+    self.ticks = 0
+    self.dropped = 0
+    self._queued = 0  # frames handed to the writer; only record() touches it
+    with open(path, "wb") as f:
+      f.write(HEADER.pack(MAGIC, VERSION, boids, capacity, 0, dt, Config.SCREEN_WIDTH, Config.SCREEN_HEIGHT))
+      f.truncate(HEADER.size + capacity * boids * 3 * FRAME_DTYPE.itemsize)
+    self.frames = np.memmap(path, dtype=FRAME_DTYPE, mode="r+", offset=HEADER.size, shape=(capacity, boids, 3))
+    self.header = np.memmap(path, dtype=np.uint8, mode="r+", shape=(HEADER.size,))
+    self._queue: queue.Queue = queue.Queue(queue_size)
+    self._writer = threading.Thread(target=self._write_loop, name="boids-recorder", daemon=True)
+    self._writer.start()
+
+  def record(self, boids) -> None:
+    if self._queued >= self.capacity:
+      self.dropped += 1
+      return
+    snapshot = Snapshot.capture(boids, 0, 0.0)
+    self._queued += 1
+    self._queue.put((snapshot.pos, snapshot.vel))
+
+  def _write_loop(self):
+    while True:
+      item = self._queue.get()
+      if item is None:
+        break
+      if self.ticks >= self.capacity:
+        continue
+      pos, vel = item
+      frame = self.frames[self.ticks]
+      frame[:, 0:2] = pos
+      frame[:, 2] = np.arctan2(vel[:, 1], vel[:, 0])
+      self.ticks += 1
+      if self.ticks % 64 == 0:
+        self._write_count()
+
+  def _write_count(self):
+    HEADER.pack_into(self.header, 0, MAGIC, VERSION, self.boids, self.capacity, self.ticks, self.dt,
+                     Config.SCREEN_WIDTH, Config.SCREEN_HEIGHT)
+
+  def close(self) -> None:
+    if self._writer.is_alive():
+      self._queue.put(None)
+      self._writer.join()
+    self._write_count()
+    self.frames.flush()
+    self.header.flush()
+
+  def __enter__(self):
+    return self
+
+  def __exit__(self, *exc):
+    self.close()
+
+
+class Trajectory:
+  def __init__(self, frames:np.ndarray, dt:float, width:int, height:int):
+    self.frames = frames
+    self.dt = dt
+    self.width = width
+    self.height = height
+
+  def __len__(self) -> int:
+    return len(self.frames)
+
+  @property
+  def boids(self) -> int:
+    return self.frames.shape[1]
+
+  def snapshot(self, tick:int) -> Snapshot:
+    """Frame `tick` as a Snapshot the renderers can draw; vel is the unit heading."""
+    frame = self.frames[tick]
+    heading = frame[:, 2].astype(np.float64)
+    vel = np.stack([np.cos(heading), np.sin(heading)], axis=1)
+    return Snapshot(tick, tick * self.dt, frame[:, 0:2].astype(np.float64), vel)
+
+
+def read_header(path:str):
+  with open(path, "rb") as f:
+    raw = f.read(HEADER.size)
+  if len(raw) != HEADER.size:
+    raise ValueError(f"{path}: file too short for a trajectory header")
+  magic, version, boids, capacity, ticks, dt, width, height = HEADER.unpack(raw)
+  if magic != MAGIC:
+    raise ValueError(f"{path}: not a boids trajectory file")
+  if version != VERSION:
+    raise ValueError(f"{path}: unsupported trajectory file version {version}")
+  return boids, capacity, ticks, dt, width, height
+
+
+def load_trajectory(path:str) -> Trajectory:
+  boids, capacity, ticks, dt, width, height = read_header(path)
+  expected = HEADER.size + capacity * boids * 3 * FRAME_DTYPE.itemsize
+  if os.path.getsize(path) != expected:
+    raise ValueError(f"{path}: expected {expected} bytes, found {os.path.getsize(path)}")
+  frames = np.memmap(path, dtype=FRAME_DTYPE, mode="r", offset=HEADER.size, shape=(capacity, boids, 3))
+  return Trajectory(frames[:ticks], dt, width, height)
@@ -0,0 +1,7 @@
+#pragma once
+
+#include "../inc/board.h"
+
+void active_load();
+void active_advance(long generations);
+double active_cells_per_generation();
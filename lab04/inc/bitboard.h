@@ -0,0 +1,15 @@
+#pragma once
+#include <stdint.h>
+
+#include "../inc/board.h"
+
+// 64 cells per word, bit i of word k is column 64 * k + i
+#define words_x ((width_x + 63) / 64)
+
+typedef struct {
+    uint64_t rows[height_y][words_x];
+} bit_board;
+
+void pack_board(cell_entity board[height_y][width_x], bit_board *bits);
+void unpack_board(const bit_board *bits, cell_entity board[height_y][width_x]);
+void bit_board_step(const bit_board *src, bit_board *dst);
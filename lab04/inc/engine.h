@@ -0,0 +1,17 @@
+#pragma once
+
+typedef enum {
+    ENGINE_CELLS = 0,   // update_board_state on cell_entity boards (rules.c)
+    ENGINE_BITS,        // 64 cells per word, bitwise adders (bitboard.c)
+    ENGINE_HASHLIFE,    // memoized quadtree, 2^k generations per step (hashlife.c)
+    ENGINE_ACTIVE,      // rules.c on cells next to last generation's changes (active.c)
+    ENGINE_THREADS,     // pthread stripes over a heap board (parallel.c)
+    ENGINE_COUNT
+} engine_kind;
+
+extern const char *engine_names[ENGINE_COUNT];
+
+int parse_engine(const char *name);
+void engine_load(engine_kind engine);
+void engine_advance(engine_kind engine, long generations);
+void engine_store(engine_kind engine);
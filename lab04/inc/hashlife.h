@@ -0,0 +1,15 @@
+#pragma once
+#include <stddef.h>
+
+#include "../inc/board.h"
+
+// smallest accepted node limit
+#define HASHLIFE_MIN_NODES 1024
+
+void hashlife_init(size_t node_limit);
+void hashlife_load(cell_entity board[height_y][width_x]);
+void hashlife_advance(long generations);
+void hashlife_store(cell_entity board[height_y][width_x]);
+size_t hashlife_node_count();
+size_t hashlife_gc_runs();
+size_t hashlife_peak_nodes();
@@ -0,0 +1,29 @@
+#pragma once
+
+#include "../inc/board.h"
+
+// Board sized at run time, one cell_status byte per cell, two buffers.
+// Like main_board, the outermost rows and columns are WALL.
+typedef struct {
+    int width;
+    int height;
+    unsigned char *cells[2];
+    int current;
+} life_board;
+
+typedef struct worker_pool worker_pool;
+
+life_board *life_board_create(int width, int height);
+void life_board_free(life_board *board);
+void life_board_randomize(life_board *board, unsigned seed, int percent);
+void life_board_from_cells(life_board *board, cell_entity cells[height_y][width_x]);
+void life_board_to_cells(const life_board *board, cell_entity cells[height_y][width_x]);
+
+worker_pool *worker_pool_create(life_board *board, int threads);
+void worker_pool_advance(worker_pool *pool, long generations);
+void worker_pool_destroy(worker_pool *pool);
+
+void parallel_set_threads(int threads);
+void parallel_load();
+void parallel_advance(long generations);
+void parallel_store();
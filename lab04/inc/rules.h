@@ -1,4 +1,7 @@
 #pragma once
+#include "../inc/cell.h"
+
 int check_cell_neighbors(cell_entity *cell);
+cell_status next_cell_state(cell_entity *cell, int alive_neghbors);
 void change_cell_state(cell_entity *cell, int alive_neghbors);
 void update_board_state();
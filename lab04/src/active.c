@@ -0,0 +1,89 @@
+#include <string.h>
+
+#include "../inc/active.h"
+#include "../inc/board.h"
+#include "../inc/cell.h"
+#include "../inc/rules.h"
+
+// Active-region engine on main_board with the rules of rules.c.
+// A cell can only change if it or one of its neighbors changed in the
+// previous generation, so only the cells that flipped last time and their
+// neighbors are evaluated. The new states are collected first and written
+// afterwards, so no full board copy is needed either.
+// The first generation after active_load evaluates the whole interior.
+
+#define interior_cells ((height_y - 2) * (width_x - 2))
+
+static cell_entity *flipped[interior_cells];
+static int n_flipped = 0;
+static int full_scan = 1;
+
+// generation stamp per cell, so a candidate is evaluated once per generation
+static long seen[height_y][width_x];
+static long generation = 0;
+static long cells_evaluated = 0;
+
+void active_load()
+{
+  full_scan = 1;
+  n_flipped = 0;
+  generation = 0;
+  cells_evaluated = 0;
+  memset(seen, 0, sizeof(seen));
+}
+
+static cell_entity *candidates[interior_cells];
+static cell_entity *flips[interior_cells];
+
+static void step()
+{
+  int n_candidates = 0;
+  generation++;
+  if (full_scan) {
+    for (int y = 1; y < height_y - 1; y++)
+      for (int x = 1; x < width_x - 1; x++)
+        candidates[n_candidates++] = &main_board[y][x];
+    full_scan = 0;
+  } else {
+    for (int i = 0; i < n_flipped; i++){
+      int cx = flipped[i]->pos_x, cy = flipped[i]->pos_y;
+      for (int y = cy - 1; y <= cy + 1; y++){
+        for (int x = cx - 1; x <= cx + 1; x++){
+          // walls are never updated, like in update_board_state
+          if (y < 1 || y >= height_y - 1 || x < 1 || x >= width_x - 1 || seen[y][x] == generation)
+            continue;
+          seen[y][x] = generation;
+          candidates[n_candidates++] = &main_board[y][x];
+        }
+      }
+    }
+  }
+  cells_evaluated += n_candidates;
+
+  int n_flips = 0;
+  for (int i = 0; i < n_candidates; i++){
+    cell_entity *cell = candidates[i];
+    if (next_cell_state(cell, check_cell_neighbors(cell)) != cell->cell_type)
+      flips[n_flips++] = cell;
+  }
+
+  for (int i = 0; i < n_flips; i++){
+    if (flips[i]->cell_type == ALIVE)
+      cell_die(flips[i]);
+    else
+      cell_revive(flips[i]);
+    flipped[i] = flips[i];
+  }
+  n_flipped = n_flips;
+}
+
+void active_advance(long generations)
+{
+  for (long g = 0; g < generations; g++)
+    step();
+}
+
+double active_cells_per_generation()
+{
+  return generation ? (double)cells_evaluated / generation : 0.0;
+}
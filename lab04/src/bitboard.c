@@ -0,0 +1,95 @@
+#include <string.h>
+
+#include "../inc/bitboard.h"
+#include "../inc/board.h"
+#include "../inc/cell.h"
+
+// Interior of row y: the columns change_cell_state is called for
+// (1 .. width_x - 2). Walls and the padding bits past width_x stay 0.
+static uint64_t interior_mask(int word)
+{
+  uint64_t mask = ~0ULL;
+  if (word == 0)
+    mask &= ~1ULL;
+  int last = width_x - 2;
+  if (word == last / 64) {
+    int bits = last % 64 + 1;
+    if (bits < 64)
+      mask &= (1ULL << bits) - 1;
+  } else if (word > last / 64) {
+    mask = 0;
+  }
+  return mask;
+}
+
+void pack_board(cell_entity board[height_y][width_x], bit_board *bits)
+{
+  memset(bits, 0, sizeof(*bits));
+  for (int y = 0; y < height_y; y++){
+    for (int x = 0; x < width_x; x++){
+      if (board[y][x].cell_type == ALIVE)
+        bits->rows[y][x / 64] |= 1ULL << (x % 64);
+    }
+  }
+}
+
+void unpack_board(const bit_board *bits, cell_entity board[height_y][width_x])
+{
+  for (int y = 1; y < height_y - 1; y++){
+    for (int x = 1; x < width_x - 1; x++){
+      board[y][x].cell_type = (bits->rows[y][x / 64] >> (x % 64)) & 1 ? ALIVE : DEAD;
+    }
+  }
+}
+
+// Row shifted so that bit x holds column x - 1 (west) / x + 1 (east)
+static inline uint64_t west_of(const uint64_t *row, int k)
+{
+  return (row[k] << 1) | (k > 0 ? row[k - 1] >> 63 : 0);
+}
+
+static inline uint64_t east_of(const uint64_t *row, int k)
+{
+  return (row[k] >> 1) | (k + 1 < words_x ? row[k + 1] << 63 : 0);
+}
+
+// B3/S23 for 64 cells at once. Every neighbor row is summed with bitwise
+// adders: the rows above and below give 2-bit counts (west + center + east),
+// the own row gives west + east. The low bits go through one full adder;
+// the cell is alive next when exactly one weight-2 bit is set (count 2 or 3)
+// and either the weight-1 bit is set (3) or the cell is alive (2).
+void bit_board_step(const bit_board *src, bit_board *dst)
+{
+  memset(dst->rows[0], 0, sizeof(dst->rows[0]));
+  memset(dst->rows[height_y - 1], 0, sizeof(dst->rows[0]));
+
+  for (int y = 1; y < height_y - 1; y++){
+    const uint64_t *up = src->rows[y - 1];
+    const uint64_t *mid = src->rows[y];
+    const uint64_t *down = src->rows[y + 1];
+
+    for (int k = 0; k < words_x; k++){
+      uint64_t a = west_of(up, k), b = up[k], c = east_of(up, k);
+      uint64_t up_ones = a ^ b ^ c;
+      uint64_t up_twos = (a & b) | (c & (a ^ b));
+
+      a = west_of(down, k), b = down[k], c = east_of(down, k);
+      uint64_t down_ones = a ^ b ^ c;
+      uint64_t down_twos = (a & b) | (c & (a ^ b));
+
+      a = west_of(mid, k), c = east_of(mid, k);
+      uint64_t mid_ones = a ^ c;
+      uint64_t mid_twos = a & c;
+
+      uint64_t ones = up_ones ^ mid_ones ^ down_ones;
+      uint64_t carry = (up_ones & mid_ones) | (down_ones & (up_ones ^ mid_ones));
+
+      // exactly one of the four weight-2 bits
+      uint64_t odd = up_twos ^ mid_twos ^ down_twos ^ carry;
+      uint64_t pair = (up_twos & mid_twos) | (up_twos & down_twos) | (up_twos & carry)
+                    | (mid_twos & down_twos) | (mid_twos & carry) | (down_twos & carry);
+
+      dst->rows[y][k] = odd & ~pair & (ones | mid[k]) & interior_mask(k);
+    }
+  }
+}
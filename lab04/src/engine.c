@@ -0,0 +1,90 @@
+#include <string.h>
+
+#include "../inc/active.h"
+#include "../inc/bitboard.h"
+#include "../inc/board.h"
+#include "../inc/engine.h"
+#include "../inc/hashlife.h"
+#include "../inc/parallel.h"
+#include "../inc/rules.h"
+
+// Every engine keeps its own representation of the board:
+// engine_load takes main_board as the current generation,
+// engine_advance moves it forward, engine_store writes it back to main_board.
+
+const char *engine_names[ENGINE_COUNT] = { "cells", "bits", "hashlife", "active", "threads" };
+
+static bit_board bit_boards[2];
+static int bit_current = 0;
+
+int parse_engine(const char *name)
+{
+  for (int i = 0; i < ENGINE_COUNT; i++){
+    if (strcmp(name, engine_names[i]) == 0)
+      return i;
+  }
+  return -1;
+}
+
+void engine_load(engine_kind engine)
+{
+  switch (engine){
+    case ENGINE_BITS:
+      bit_current = 0;
+      pack_board(main_board, &bit_boards[0]);
+      break;
+    case ENGINE_HASHLIFE:
+      hashlife_load(main_board);
+      break;
+    case ENGINE_ACTIVE:
+      active_load();
+      break;
+    case ENGINE_THREADS:
+      parallel_load();
+      break;
+    default:
+      break;
+  }
+}
+
+void engine_advance(engine_kind engine, long generations)
+{
+  switch (engine){
+    case ENGINE_BITS:
+      for (long g = 0; g < generations; g++){
+        bit_board_step(&bit_boards[bit_current], &bit_boards[!bit_current]);
+        bit_current = !bit_current;
+      }
+      break;
+    case ENGINE_HASHLIFE:
+      hashlife_advance(generations);
+      break;
+    case ENGINE_ACTIVE:
+      active_advance(generations);
+      break;
+    case ENGINE_THREADS:
+      parallel_advance(generations);
+      break;
+    default:
+      for (long g = 0; g < generations; g++)
+        update_board_state();
+      break;
+  }
+}
+
+void engine_store(engine_kind engine)
+{
+  switch (engine){
+    case ENGINE_BITS:
+      unpack_board(&bit_boards[bit_current], main_board);
+      break;
+    case ENGINE_HASHLIFE:
+      hashlife_store(main_board);
+      break;
+    case ENGINE_THREADS:
+      parallel_store();
+      break;
+    default:
+      break;
+  }
+}
@@ -0,0 +1,410 @@
+#include <setjmp.h>
+#include <stdint.h>
+#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+
+#include "../inc/board.h"
+#include "../inc/cell.h"
+#include "../inc/hashlife.h"
+
+// HashLife: the board is a quadtree of hash-consed nodes (equal squares are
+// the same node) and every node remembers its own future.
+//
+// A node of level k is a 2^k x 2^k square. Its result for step j is the
+// center 2^(k-1) square advanced 2^j generations (j <= k-2). It is built
+// from nine overlapping level k-1 squares, each advanced or just centered,
+// and then four level k-1 squares advanced again - so one call on a big
+// node advances everything inside it by 2^j generations at once, and any
+// square seen before is answered from its node without recomputing.
+//
+// Cells have three states like cell_entity: DEAD, ALIVE and WALL. A wall
+// never changes and does not count as a neighbor, so the border rule of
+// rules.c holds exactly. The board is placed in the center of a universe
+// whose remaining cells are walls, so nothing ever leaves it.
+//
+// Nodes live in one pool and are addressed by index (0 = none); the pool
+// never grows past the node limit. When it is more than half full between
+// two steps a copying collector moves the nodes reachable from the root into
+// a fresh pool and drops every memoized result. If the pool fills up in the
+// middle of a step, the step is abandoned (the root has not changed yet),
+// the pool is collected and the step is retried with half the generations.
+
+typedef struct {
+  uint32_t child[4];   // nw, ne, sw, se; leaves keep their state in child[0]
+  uint32_t next;       // hash chain
+  uint32_t result;     // memoized result for step result_step
+  uint8_t level;
+  int8_t result_step;
+  uint8_t alive;       // any ALIVE cell inside
+} hl_node;
+
+enum { NW = 0, NE, SW, SE };
+
+static hl_node *pool = NULL;
+static size_t pool_size = 0;      // nodes in use, index 0 unused
+static size_t pool_capacity = 0;
+static size_t pool_limit = 0;
+static uint32_t *buckets = NULL;
+static size_t bucket_mask = 0;
+static size_t gc_runs = 0;
+static size_t pool_peak = 0;      // most nodes in use at once since hashlife_init
+static jmp_buf *pool_full = NULL; // where make_node jumps when the pool is full
+
+static int universe_level = 0;    // root level
+static int board_offset = 0;      // board cell (x, y) is universe cell (x + offset, y + offset)
+static uint32_t root = 0;
+static uint32_t wall_nodes[32];   // all-wall square of every level
+
+static size_t hash_node(int level, const uint32_t child[4])
+{
+  uint64_t h = level * 0x9E3779B97F4A7C15ULL;
+  for (int i = 0; i < 4; i++)
+    h = (h ^ child[i]) * 0xBF58476D1CE4E5B9ULL;
+  return (size_t)(h ^ (h >> 31));
+}
+
+static void rebuild_buckets(size_t count)
+{
+  size_t n = 1;
+  while (n < count)
+    n <<= 1;
+  free(buckets);
+  buckets = calloc(n, sizeof(*buckets));
+  if (buckets == NULL) {
+    fprintf(stderr, "hashlife: out of memory\n");
+    exit(1);
+  }
+  bucket_mask = n - 1;
+  for (size_t i = 1; i < pool_size; i++){
+    size_t b = hash_node(pool[i].level, pool[i].child) & bucket_mask;
+    pool[i].next = buckets[b];
+    buckets[b] = i;
+  }
+}
+
+static void reserve(size_t capacity)
+{
+  hl_node *grown = realloc(pool, capacity * sizeof(*pool));
+  if (grown == NULL) {
+    fprintf(stderr, "hashlife: out of memory for %zu nodes\n", capacity);
+    exit(1);
+  }
+  pool = grown;
+  pool_capacity = capacity;
+  rebuild_buckets(capacity);
+}
+
+static void fail_full(const char *what)
+{
+  fprintf(stderr, "hashlife: %zu nodes are not enough for %s, raise --hashlife-nodes\n", pool_limit, what);
+  exit(1);
+}
+
+// The canonical node with these children
+static uint32_t make_node(int level, uint32_t nw, uint32_t ne, uint32_t sw, uint32_t se)
+{
+  uint32_t child[4] = { nw, ne, sw, se };
+  size_t b = hash_node(level, child) & bucket_mask;
+  for (uint32_t i = buckets[b]; i; i = pool[i].next){
+    if (pool[i].level == level && memcmp(pool[i].child, child, sizeof(child)) == 0)
+      return i;
+  }
+  if (pool_size == pool_capacity) {
+    if (pool_full != NULL)
+      longjmp(*pool_full, 1);
+    fail_full("the board");
+  }
+  uint32_t n = pool_size++;
+  if (pool_size > pool_peak)
+    pool_peak = pool_size;
+  hl_node *node = &pool[n];
+  memcpy(node->child, child, sizeof(child));
+  node->level = level;
+  node->result = 0;
+  node->result_step = -1;
+  node->alive = level == 0
+    ? nw == ALIVE
+    : pool[nw].alive | pool[ne].alive | pool[sw].alive | pool[se].alive;
+  node->next = buckets[b];
+  buckets[b] = n;
+  return n;
+}
+
+static uint32_t make_leaf(cell_status state)
+{
+  return make_node(0, state, 0, 0, 0);
+}
+
+#define CHILD(n, q) (pool[(n)].child[(q)])
+
+static cell_status leaf_state(uint32_t leaf)
+{
+  return (cell_status)CHILD(leaf, 0);
+}
+
+static void make_wall_nodes()
+{
+  wall_nodes[0] = make_leaf(WALL);
+  for (int k = 1; k <= universe_level; k++){
+    uint32_t w = wall_nodes[k - 1];
+    wall_nodes[k] = make_node(k, w, w, w, w);
+  }
+}
+
+// One generation of the center 2x2 of a 4x4 node, cell by cell
+static uint32_t base_result(uint32_t n)
+{
+  cell_status cells[4][4];
+  for (int q = 0; q < 4; q++){
+    uint32_t sub = CHILD(n, q);
+    int oy = (q / 2) * 2, ox = (q % 2) * 2;
+    for (int r = 0; r < 4; r++)
+      cells[oy + r / 2][ox + r % 2] = leaf_state(CHILD(sub, r));
+  }
+  uint32_t out[4];
+  for (int q = 0; q < 4; q++){
+    int y = 1 + q / 2, x = 1 + q % 2;
+    cell_status state = cells[y][x];
+    if (state != WALL) {
+      int alive = 0;
+      for (int dy = -1; dy <= 1; dy++)
+        for (int dx = -1; dx <= 1; dx++)
+          if ((dy || dx) && cells[y + dy][x + dx] == ALIVE)
+            alive++;
+      if (state == ALIVE && (alive < 2 || alive > 3))
+        state = DEAD;
+      else if (state == DEAD && alive == 3)
+        state = ALIVE;
+    }
+    out[q] = make_leaf(state);
+  }
+  return make_node(1, out[NW], out[NE], out[SW], out[SE]);
+}
+
+static uint32_t centered(uint32_t n)
+{
+  return make_node(pool[n].level - 1,
+                   CHILD(CHILD(n, NW), SE), CHILD(CHILD(n, NE), SW),
+                   CHILD(CHILD(n, SW), NE), CHILD(CHILD(n, SE), NW));
+}
+
+static uint32_t result(uint32_t n, int step)
+{
+  if (pool[n].result_step == step)
+    return pool[n].result;
+
+  int level = pool[n].level;
+  uint32_t r;
+  if (!pool[n].alive) {
+    // no live cell: nothing can be born, walls and dead cells stay as they are
+    r = centered(n);
+  } else if (level == 2) {
+    r = base_result(n);
+  } else {
+    uint32_t nw = CHILD(n, NW), ne = CHILD(n, NE), sw = CHILD(n, SW), se = CHILD(n, SE);
+    int k = level - 1;
+    // nine overlapping level k squares
+    uint32_t sq[9] = {
+      nw,
+      make_node(k, CHILD(nw, NE), CHILD(ne, NW), CHILD(nw, SE), CHILD(ne, SW)),
+      ne,
+      make_node(k, CHILD(nw, SW), CHILD(nw, SE), CHILD(sw, NW), CHILD(sw, NE)),
+      make_node(k, CHILD(nw, SE), CHILD(ne, SW), CHILD(sw, NE), CHILD(se, NW)),
+      make_node(k, CHILD(ne, SW), CHILD(ne, SE), CHILD(se, NW), CHILD(se, NE)),
+      sw,
+      make_node(k, CHILD(sw, NE), CHILD(se, NW), CHILD(sw, SE), CHILD(se, SW)),
+      se,
+    };
+    // full step: both halves advance; shorter step: the first half only recenters
+    int full = step == level - 2;
+    for (int i = 0; i < 9; i++)
+      sq[i] = full ? result(sq[i], step - 1) : centered(sq[i]);
+    uint32_t q[4] = {
+      make_node(k, sq[0], sq[1], sq[3], sq[4]),
+      make_node(k, sq[1], sq[2], sq[4], sq[5]),
+      make_node(k, sq[3], sq[4], sq[6], sq[7]),
+      make_node(k, sq[4], sq[5], sq[7], sq[8]),
+    };
+    int rest = full ? step - 1 : step;
+    for (int i = 0; i < 4; i++)
+      q[i] = result(q[i], rest);
+    r = make_node(k, q[0], q[1], q[2], q[3]);
+  }
+  pool[n].result = r;
+  pool[n].result_step = step;
+  return r;
+}
+
+// Copying collection: only the root and the wall squares survive, results are dropped
+static uint32_t copy_node(uint32_t n, hl_node *from, uint32_t *moved)
+{
+  if (moved[n])
+    return moved[n];
+  hl_node old = from[n];
+  uint32_t copy;
+  if (old.level == 0) {
+    copy = make_leaf((cell_status)old.child[0]);
+  } else {
+    uint32_t c[4];
+    for (int q = 0; q < 4; q++)
+      c[q] = copy_node(old.child[q], from, moved);
+    copy = make_node(old.level, c[NW], c[NE], c[SW], c[SE]);
+  }
+  moved[n] = copy;
+  return copy;
+}
+
+static void collect()
+{
+  hl_node *from = pool;
+  size_t from_size = pool_size;
+  uint32_t *moved = calloc(from_size, sizeof(*moved));
+  pool = malloc(pool_limit * sizeof(*pool));
+  if (moved == NULL || pool == NULL) {
+    fprintf(stderr, "hashlife: out of memory during collection\n");
+    exit(1);
+  }
+  pool_capacity = pool_limit;
+  pool_size = 1;
+  rebuild_buckets(pool_limit);
+  for (int k = 0; k <= universe_level; k++)
+    wall_nodes[k] = copy_node(wall_nodes[k], from, moved);
+  root = copy_node(root, from, moved);
+  free(moved);
+  free(from);
+  gc_runs++;
+}
+
+void hashlife_init(size_t node_limit)
+{
+  if (node_limit < HASHLIFE_MIN_NODES) {
+    fprintf(stderr, "hashlife: node limit %zu is below %d\n", node_limit, HASHLIFE_MIN_NODES);
+    exit(1);
+  }
+  int size = width_x > height_y ? width_x : height_y;
+  universe_level = 3;
+  while ((1 << (universe_level - 1)) < size)
+    universe_level++;
+  board_offset = 1 << (universe_level - 2);
+
+  free(pool);
+  pool_limit = node_limit;
+  pool = NULL;
+  pool_size = 1;
+  pool_peak = 1;
+  gc_runs = 0;
+  reserve(pool_limit);
+  make_wall_nodes();
+  root = wall_nodes[universe_level];
+}
+
+static uint32_t build(cell_entity board[height_y][width_x], int level, int x0, int y0)
+{
+  // squares fully outside the board are walls
+  int bx = x0 - board_offset, by = y0 - board_offset, side = 1 << level;
+  if (bx >= width_x || by >= height_y || bx + side <= 0 || by + side <= 0)
+    return wall_nodes[level];
+  if (level == 0)
+    return make_leaf(board[by][bx].cell_type);
+  int half = side / 2;
+  return make_node(level,
+                   build(board, level - 1, x0, y0), build(board, level - 1, x0 + half, y0),
+                   build(board, level - 1, x0, y0 + half), build(board, level - 1, x0 + half, y0 + half));
+}
+
+void hashlife_load(cell_entity board[height_y][width_x])
+{
+  if (pool == NULL)
+    hashlife_init(1 << 21);
+  root = build(board, universe_level, 0, 0);
+}
+
+// The result is the center half of the universe - exactly where the board
+// is - so it is put back in the middle of a wall universe
+static void advance_root(int step)
+{
+  int k = universe_level - 2;
+  uint32_t w = wall_nodes[k];
+  uint32_t center = result(root, step);
+  root = make_node(universe_level,
+                   make_node(k + 1, w, w, w, CHILD(center, NW)),
+                   make_node(k + 1, w, w, CHILD(center, NE), w),
+                   make_node(k + 1, w, CHILD(center, SW), w, w),
+                   make_node(k + 1, CHILD(center, SE), w, w, w));
+}
+
+// 1 if the step fit in the pool; 0 if the pool filled up first, in which
+// case root is unchanged and the half-built nodes are garbage
+static int try_advance_root(int step)
+{
+  jmp_buf full;
+  if (setjmp(full)) {
+    pool_full = NULL;
+    return 0;
+  }
+  pool_full = &full;
+  advance_root(step);
+  pool_full = NULL;
+  return 1;
+}
+
+void hashlife_advance(long generations)
+{
+  int max_step = universe_level - 2;
+  while (generations > 0) {
+    if (pool_size > pool_limit / 2)
+      collect();
+    int step = max_step;
+    while ((1L << step) > generations)
+      step--;
+    int retried = 0;
+    while (!try_advance_root(step)) {
+      collect();
+      if (step > 0)
+        step--;
+      else if (retried++)
+        fail_full("one generation");
+    }
+    generations -= 1L << step;
+  }
+}
+
+static void store(cell_entity board[height_y][width_x], uint32_t n, int x0, int y0)
+{
+  int level = pool[n].level, side = 1 << level;
+  int bx = x0 - board_offset, by = y0 - board_offset;
+  if (bx >= width_x || by >= height_y || bx + side <= 0 || by + side <= 0)
+    return;
+  if (level == 0) {
+    cell_status state = leaf_state(n);
+    if (state != WALL)
+      board[by][bx].cell_type = state;
+    return;
+  }
+  int half = side / 2;
+  store(board, CHILD(n, NW), x0, y0);
+  store(board, CHILD(n, NE), x0 + half, y0);
+  store(board, CHILD(n, SW), x0, y0 + half);
+  store(board, CHILD(n, SE), x0 + half, y0 + half);
+}
+
+void hashlife_store(cell_entity board[height_y][width_x])
+{
+  store(board, root, 0, 0);
+}
+
+size_t hashlife_node_count()
+{
+  return pool_size - 1;
+}
+
+size_t hashlife_gc_runs()
+{
+  return gc_runs;
+}
+
+size_t hashlife_peak_nodes()
+{
+  return pool_peak - 1;
+}
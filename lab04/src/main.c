@@ -2,21 +2,25 @@
 #include <unistd.h>
 #include <time.h>
 #include <stdlib.h>
+#include <string.h>
 
+#include "../inc/active.h"
 #include "../inc/cell.h"
 #include "../inc/board.h"
+#include "../inc/engine.h"
+#include "../inc/hashlife.h"
+#include "../inc/parallel.h"
 #include "../inc/render.h"
 #include "../inc/rules.h"
 #include "../inc/utils.h"
 
+static cell_entity start_board[height_y][width_x];
+static cell_entity reference_board[height_y][width_x];
 
-int main()
+static void populate_board(unsigned seed)
 {
-  // init plain board
-  init_board();
-
   // Generate some alive cells on the board
-  srand(time(NULL));
+  srand(seed);
   for (int y = 1; y < height_y - 1; y++) {
     for (int x = 1; x < width_x - 1; x++) {
       int noise = (rand() % 100) < 2; 
@@ -38,19 +42,194 @@ int main()
       }
     }
   }
+}
+
+static double now_sec()
+{
+  struct timespec ts;
+  clock_gettime(CLOCK_MONOTONIC, &ts);
+  return ts.tv_sec + ts.tv_nsec / 1e9;
+}
+
+static int boards_equal(cell_entity a[height_y][width_x], cell_entity b[height_y][width_x])
+{
+  for (int y = 0; y < height_y; y++){
+    for (int x = 0; x < width_x; x++){
+      if (a[y][x].cell_type != b[y][x].cell_type)
+        return 0;
+    }
+  }
+  return 1;
+}
 
+// Every engine runs `generations` generations from the same start board;
+// the result of each is compared with the cells engine (rules.c).
+// `only` >= 0 runs just that engine next to the reference.
+static void run_benchmark(long generations, int only)
+{
+  memcpy(start_board, main_board, sizeof(main_board));
+  printf("board %dx%d, %ld generations\n", width_x, height_y, generations);
+  printf("%-8s %10s %14s %10s\n", "engine", "time, s", "gens/sec", "result");
 
+  for (int e = 0; e < ENGINE_COUNT; e++){
+    if (only >= 0 && e != only && e != ENGINE_CELLS)
+      continue;
+    memcpy(main_board, start_board, sizeof(main_board));
+    double start = now_sec();
+    engine_load(e);
+    engine_advance(e, generations);
+    engine_store(e);
+    double elapsed = now_sec() - start;
+
+    const char *result = "reference";
+    if (e == ENGINE_CELLS)
+      memcpy(reference_board, main_board, sizeof(main_board));
+    else
+      result = boards_equal(main_board, reference_board) ? "identical" : "DIFFERENT";
+    printf("%-8s %10.4f %14.1f %10s\n", engine_names[e], elapsed, generations / elapsed, result);
+    if (e == ENGINE_HASHLIFE)
+      printf("         %zu nodes, peak %zu, %zu collections\n", hashlife_node_count(), hashlife_peak_nodes(), hashlife_gc_runs());
+    if (e == ENGINE_ACTIVE)
+      printf("         %.1f of %d cells evaluated per generation\n", active_cells_per_generation(), (height_y - 2) * (width_x - 2));
+  }
+}
+
+// The threads engine on a heap board of any size: the same random board
+// advanced with 1, 2, 4 ... max_threads workers, each result compared with
+// the single-threaded one
+static int run_scaling(int width, int height, long generations, int max_threads, unsigned seed)
+{
+  life_board *board = life_board_create(width, height);
+  size_t size = (size_t)width * height;
+  unsigned char *start = malloc(size);
+  unsigned char *single = malloc(size);
+  if (board == NULL || start == NULL || single == NULL) {
+    fprintf(stderr, "not enough memory for a %dx%d board\n", width, height);
+    free(start);
+    free(single);
+    life_board_free(board);
+    return 1;
+  }
+  life_board_randomize(board, seed, 15);
+  memcpy(start, board->cells[board->current], size);
+
+  printf("board %dx%d, %ld generations\n", width, height, generations);
+  printf("%-8s %10s %12s %9s %10s\n", "threads", "time, s", "gens/sec", "speedup", "result");
+  double base = 0.0;
+  for (int threads = 1; threads <= max_threads; threads *= 2){
+    board->current = 0;
+    memcpy(board->cells[0], start, size);
+    worker_pool *pool = worker_pool_create(board, threads);
+    double begin = now_sec();
+    worker_pool_advance(pool, generations);
+    double elapsed = now_sec() - begin;
+    worker_pool_destroy(pool);
+
+    const char *result = "reference";
+    if (threads == 1) {
+      base = elapsed;
+      memcpy(single, board->cells[board->current], size);
+    } else {
+      result = memcmp(single, board->cells[board->current], size) == 0 ? "identical" : "DIFFERENT";
+    }
+    printf("%-8d %10.4f %12.2f %8.2fx %10s\n", threads, elapsed, generations / elapsed, base / elapsed, result);
+  }
+  free(start);
+  free(single);
+  life_board_free(board);
+  return 0;
+}
+
+static void usage(const char *prog)
+{
+  fprintf(stderr, "usage: %s [--engine", prog);
+  for (int e = 0; e < ENGINE_COUNT; e++)
+    fprintf(stderr, "%s%s", e ? "|" : " ", engine_names[e]);
+  fprintf(stderr, "] [--seed N] [--step GENERATIONS] [--bench GENERATIONS] [--hashlife-nodes N]\n"
+                  "       [--threads N] [--scaling GENERATIONS] [--size WIDTH HEIGHT]\n");
+}
+
+int main(int argc, char **argv)
+{
+  engine_kind engine = ENGINE_CELLS;
+  int engine_given = 0;
+  unsigned seed = time(NULL);
+  long bench_generations = 0;
+  long step = 1;
+  size_t hashlife_nodes = 1 << 21;
+  int threads = 4;
+  long scaling_generations = 0;
+  int scaling_width = 10000, scaling_height = 10000;
+
+  for (int i = 1; i < argc; i++){
+    if (strcmp(argv[i], "--engine") == 0 && i + 1 < argc) {
+      int parsed = parse_engine(argv[++i]);
+      if (parsed < 0) {
+        usage(argv[0]);
+        return 1;
+      }
+      engine = parsed;
+      engine_given = 1;
+    } else if (strcmp(argv[i], "--seed") == 0 && i + 1 < argc) {
+      seed = strtoul(argv[++i], NULL, 10);
+    } else if (strcmp(argv[i], "--bench") == 0 && i + 1 < argc) {
+      bench_generations = strtol(argv[++i], NULL, 10);
+    } else if (strcmp(argv[i], "--step") == 0 && i + 1 < argc) {
+      step = strtol(argv[++i], NULL, 10);
+    } else if (strcmp(argv[i], "--hashlife-nodes") == 0 && i + 1 < argc) {
+      hashlife_nodes = strtoul(argv[++i], NULL, 10);
+      if (hashlife_nodes < HASHLIFE_MIN_NODES) {
+        fprintf(stderr, "--hashlife-nodes must be at least %d\n", HASHLIFE_MIN_NODES);
+        return 1;
+      }
+    } else if (strcmp(argv[i], "--threads") == 0 && i + 1 < argc) {
+      threads = atoi(argv[++i]);
+      if (threads < 1) {
+        fprintf(stderr, "--threads must be at least 1\n");
+        return 1;
+      }
+    } else if (strcmp(argv[i], "--scaling") == 0 && i + 1 < argc) {
+      scaling_generations = strtol(argv[++i], NULL, 10);
+    } else if (strcmp(argv[i], "--size") == 0 && i + 2 < argc) {
+      scaling_width = atoi(argv[++i]);
+      scaling_height = atoi(argv[++i]);
+      // the outer rows and columns are walls, so 3x3 is the smallest board
+      if (scaling_width < 3 || scaling_height < 3) {
+        fprintf(stderr, "--size must be at least 3 3\n");
+        return 1;
+      }
+    } else {
+      usage(argv[0]);
+      return 1;
+    }
+  }
+
+  if (scaling_generations > 0)
+    return run_scaling(scaling_width, scaling_height, scaling_generations, threads, seed);
+
+  // init plain board
+  init_board();
+  populate_board(seed);
+  hashlife_init(hashlife_nodes);
+  parallel_set_threads(threads);
+
+  if (bench_generations > 0) {
+    run_benchmark(bench_generations, engine_given ? (int)engine : -1);
+    return 0;
+  }
 
   // MAIN LOOP
+  engine_load(engine);
   for (;;){
 
     draw_frame(main_board);
     
-    update_board_state();
+    engine_advance(engine, step);
+    engine_store(engine);
     
     sleep_ms(50);
 
   }
 
   return 0;
-}
\ No newline at end of file
+}
@@ -0,0 +1,218 @@
+#include <pthread.h>
+#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+
+#include "../inc/board.h"
+#include "../inc/cell.h"
+#include "../inc/parallel.h"
+
+// Stripe-parallel generations on a heap board.
+// Every worker owns a band of rows and writes only those rows of the back
+// buffer; it reads its band plus one row above and below from the front
+// buffer. After a generation all workers meet at a barrier and each of them
+// flips `current` in its own copy, so the buffers swap without any copying
+// and without waking the main thread.
+
+life_board *life_board_create(int width, int height)
+{
+  if (width < 3 || height < 3)
+    return NULL;
+  life_board *board = malloc(sizeof(*board));
+  if (board == NULL)
+    return NULL;
+  board->width = width;
+  board->height = height;
+  board->current = 0;
+  size_t size = (size_t)width * height;
+  board->cells[0] = malloc(size);
+  board->cells[1] = malloc(size);
+  if (board->cells[0] == NULL || board->cells[1] == NULL) {
+    life_board_free(board);
+    return NULL;
+  }
+  for (int b = 0; b < 2; b++){
+    memset(board->cells[b], DEAD, size);
+    for (int x = 0; x < width; x++){
+      board->cells[b][x] = WALL;
+      board->cells[b][(size_t)(height - 1) * width + x] = WALL;
+    }
+    for (int y = 0; y < height; y++){
+      board->cells[b][(size_t)y * width] = WALL;
+      board->cells[b][(size_t)y * width + width - 1] = WALL;
+    }
+  }
+  return board;
+}
+
+void life_board_free(life_board *board)
+{
+  if (board == NULL)
+    return;
+  free(board->cells[0]);
+  free(board->cells[1]);
+  free(board);
+}
+
+void life_board_randomize(life_board *board, unsigned seed, int percent)
+{
+  srand(seed);
+  unsigned char *cells = board->cells[board->current];
+  for (int y = 1; y < board->height - 1; y++)
+    for (int x = 1; x < board->width - 1; x++)
+      cells[(size_t)y * board->width + x] = (rand() % 100) < percent ? ALIVE : DEAD;
+}
+
+void life_board_from_cells(life_board *board, cell_entity cells[height_y][width_x])
+{
+  unsigned char *out = board->cells[board->current];
+  for (int y = 0; y < height_y; y++)
+    for (int x = 0; x < width_x; x++)
+      out[(size_t)y * board->width + x] = cells[y][x].cell_type;
+}
+
+void life_board_to_cells(const life_board *board, cell_entity cells[height_y][width_x])
+{
+  const unsigned char *in = board->cells[board->current];
+  for (int y = 0; y < height_y; y++)
+    for (int x = 0; x < width_x; x++)
+      cells[y][x].cell_type = in[(size_t)y * board->width + x];
+}
+
+// Rows y0 .. y1-1 of one generation. Same decisions as next_cell_state:
+// 3 neighbors -> ALIVE, 2 -> unchanged, anything else -> DEAD (= 0).
+// `c & 1` is 1 only for ALIVE (DEAD = 0, ALIVE = 1, WALL = 2), which keeps
+// the inner loop free of branches so the compiler can vectorize it.
+static void step_rows(const unsigned char *restrict src, unsigned char *restrict dst, int width, int y0, int y1)
+{
+  for (int y = y0; y < y1; y++){
+    const unsigned char *restrict up = src + (size_t)(y - 1) * width;
+    const unsigned char *restrict mid = src + (size_t)y * width;
+    const unsigned char *restrict down = src + (size_t)(y + 1) * width;
+    unsigned char *restrict out = dst + (size_t)y * width;
+    for (int x = 1; x < width - 1; x++){
+      unsigned char alive = (up[x - 1] & 1) + (up[x] & 1) + (up[x + 1] & 1)
+                          + (mid[x - 1] & 1) + (mid[x + 1] & 1)
+                          + (down[x - 1] & 1) + (down[x] & 1) + (down[x + 1] & 1);
+      out[x] = (alive == 3) * ALIVE + (alive == 2) * mid[x];
+    }
+  }
+}
+
+typedef struct {
+  worker_pool *pool;
+  int y0;
+  int y1;
+} stripe;
+
+struct worker_pool {
+  life_board *board;
+  int threads;
+  long generations;              // next command; < 0 stops the workers
+  pthread_t *ids;
+  stripe *stripes;
+  pthread_barrier_t start;       // main + workers: a command is ready
+  pthread_barrier_t done;        // main + workers: the command is finished
+  pthread_barrier_t generation;  // workers: everyone wrote the back buffer
+};
+
+static void *worker_main(void *arg)
+{
+  stripe *s = arg;
+  worker_pool *pool = s->pool;
+  life_board *board = pool->board;
+  for (;;) {
+    pthread_barrier_wait(&pool->start);
+    long generations = pool->generations;
+    if (generations < 0)
+      return NULL;
+    int current = board->current;
+    for (long g = 0; g < generations; g++){
+      step_rows(board->cells[current], board->cells[!current], board->width, s->y0, s->y1);
+      pthread_barrier_wait(&pool->generation);
+      current = !current;
+    }
+    pthread_barrier_wait(&pool->done);
+  }
+}
+
+worker_pool *worker_pool_create(life_board *board, int threads)
+{
+  int rows = board->height - 2;
+  if (threads < 1)
+    threads = 1;
+  if (threads > rows)
+    threads = rows;
+  worker_pool *pool = calloc(1, sizeof(*pool));
+  pool->board = board;
+  pool->threads = threads;
+  pool->ids = calloc(threads, sizeof(*pool->ids));
+  pool->stripes = calloc(threads, sizeof(*pool->stripes));
+  pthread_barrier_init(&pool->start, NULL, threads + 1);
+  pthread_barrier_init(&pool->done, NULL, threads + 1);
+  pthread_barrier_init(&pool->generation, NULL, threads);
+  for (int t = 0; t < threads; t++){
+    // interior rows 1 .. height-2, split as evenly as possible
+    pool->stripes[t] = (stripe){ pool, 1 + rows * t / threads, 1 + rows * (t + 1) / threads };
+    pthread_create(&pool->ids[t], NULL, worker_main, &pool->stripes[t]);
+  }
+  return pool;
+}
+
+void worker_pool_advance(worker_pool *pool, long generations)
+{
+  if (generations <= 0)
+    return;
+  pool->generations = generations;
+  pthread_barrier_wait(&pool->start);
+  pthread_barrier_wait(&pool->done);
+  if (generations % 2)
+    pool->board->current = !pool->board->current;
+}
+
+void worker_pool_destroy(worker_pool *pool)
+{
+  pool->generations = -1;
+  pthread_barrier_wait(&pool->start);
+  for (int t = 0; t < pool->threads; t++)
+    pthread_join(pool->ids[t], NULL);
+  pthread_barrier_destroy(&pool->start);
+  pthread_barrier_destroy(&pool->done);
+  pthread_barrier_destroy(&pool->generation);
+  free(pool->ids);
+  free(pool->stripes);
+  free(pool);
+}
+
+// The "threads" engine: main_board copied to a heap board of the same size
+static life_board *engine_board = NULL;
+static worker_pool *engine_pool = NULL;
+static int engine_threads = 4;
+
+void parallel_set_threads(int threads)
+{
+  engine_threads = threads;
+}
+
+void parallel_load()
+{
+  if (engine_board == NULL) {
+    engine_board = life_board_create(width_x, height_y);
+    if (engine_board == NULL) {
+      fprintf(stderr, "parallel: out of memory\n");
+      exit(1);
+    }
+    engine_pool = worker_pool_create(engine_board, engine_threads);
+  }
+  life_board_from_cells(engine_board, main_board);
+}
+
+void parallel_advance(long generations)
+{
+  worker_pool_advance(engine_pool, generations);
+}
+
+void parallel_store()
+{
+  life_board_to_cells(engine_board, main_board);
+}
@@ -27,11 +27,24 @@ int check_cell_neighbors(cell_entity *cell)
   return alive_neghbors;
 }
 
-void change_cell_state(cell_entity *cell, int alive_neghbors)
+cell_status next_cell_state(cell_entity *cell, int alive_neghbors)
 {
   if ((alive_neghbors < 2 || alive_neghbors > 3) && cell->cell_type != DEAD) {
-    cell_die(&(buffer_board[cell->pos_y][cell->pos_x]));
+    return DEAD;
   } else if ((alive_neghbors == 3) && cell->cell_type != ALIVE) {
+    return ALIVE;
+  }
+  return cell->cell_type;
+}
+
+void change_cell_state(cell_entity *cell, int alive_neghbors)
+{
+  cell_status next = next_cell_state(cell, alive_neghbors);
+  if (next == cell->cell_type)
+    return;
+  if (next == DEAD) {
+    cell_die(&(buffer_board[cell->pos_y][cell->pos_x]));
+  } else {
     cell_revive(&(buffer_board[cell->pos_y][cell->pos_x]));
   }
 }